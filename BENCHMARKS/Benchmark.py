@@ -0,0 +1,565 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+for folder in ("GRAPHS", "SORTING", "STRINGS"):
+    sys.path.insert(0, os.path.join(HERE, "..", folder))
+
+import Workloads
+import Graph
+import Digraph
+import BreadthFirstPaths
+import DepthFirstPaths
+import CC
+import IndexMinPQ
+import MaxPQ
+import MinPQ
+import PQ
+import KMP
+import RadixTrieST
+import TrieST
+import AhoCorasick
+
+"""
+Benchmark harness for the hot paths of GRAPHS, SORTING and STRINGS.
+
+Execution:
+python BENCHMARKS/Benchmark.py                       # every benchmark, scale 1
+python BENCHMARKS/Benchmark.py --filter graphs/bfs   # names containing graphs/bfs
+python BENCHMARKS/Benchmark.py --scale 10 --output after.json
+python BENCHMARKS/Benchmark.py --compare before.json after.json
+
+Each benchmark has a setup step, which builds its workload from the
+seeded generators in Workloads.py and is not timed, and a run step,
+which is timed and returns the number of operations it performed.
+The workloads are built the first time a setup step asks for them, so
+the workloads of the benchmarks that --filter skips are never built.
+The run step is timed --repeat times and the best time is reported,
+together with the operations per second of the best run.
+It is then run once more under tracemalloc to report the peak memory
+allocated by the run step, since tracing slows Python down too much
+to share a run with the timing.
+The results are printed as a table and saved as JSON, together with
+the interpreter, platform, scale and seed, so that runs can be compared
+with --compare.
+"""
+class Benchmark(object):
+
+    def __init__(self, name: str, setup, run, params: dict):
+        self.name = name     # group/benchmark name
+        self.setup = setup   # setup() returns the state passed to run
+        self.run = run       # run(state) returns the number of operations
+        self.params = params # workload parameters, or a function that returns them, saved with the results
+
+    """
+    Runs this benchmark.
+    :param repeat: the number of timed runs
+    :returns: a dict with the name, params, best time, operations,
+    operations per second and peak memory of this benchmark
+    """
+    def measure(self, repeat: int):
+        best = None
+        ops = 0
+        for _ in range(repeat):
+            state = self.setup()
+            gc.collect()
+            start = time.perf_counter()
+            ops = self.run(state)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+            del state
+
+        state = self.setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            "name": self.name,
+            "params": self.params() if callable(self.params) else self.params,
+            "seconds": best,
+            "ops": ops,
+            "opsPerSec": ops / best if best > 0 else None,
+            "peakBytes": peak,
+        }
+
+
+# registry of benchmark factories; each factory takes (scale, seed)
+# and returns a list of Benchmark instances
+_factories = []
+
+def benchmarks(factory):
+    _factories.append(factory)
+    return factory
+
+# a function that builds a workload with build(*args, **kwargs) on its
+# first call and returns that same workload on every call
+def _lazy(build, *args, **kwargs):
+    cache = []
+    def get():
+        if not cache:
+            cache.append(build(*args, **kwargs))
+        return cache[0]
+    return get
+
+
+########################################################################
+# GRAPHS
+########################################################################
+
+def _graph(workload, cls=Graph.Graph):
+    V, edges = workload
+    G = cls(V)
+    G.addEdges(edges)
+    return G
+
+@benchmarks
+def _graphBenchmarks(scale: int, seed: int):
+    V = 20000 * scale
+    sparse = _lazy(Workloads.randomGraph, V, 4 * V, seed)
+    dense = _lazy(Workloads.randomGraph, V // 20, V * 10, seed)
+    powerLaw = _lazy(Workloads.powerLawGraph, V, 8, seed)
+    path = _lazy(Workloads.longPathGraph, V)
+
+    # the parameters of a graph workload, read once it is built
+    def graphParams(workload, **extra):
+        return lambda: dict({"V": workload()[0], "E": len(workload()[1])}, **extra)
+
+    def addEdgeLoop(workload):
+        G = Graph.Graph(workload[0])
+        for v, w in workload[1]:
+            G.addEdge(v, w)
+        return len(workload[1])
+
+    def addEdgesBulk(workload):
+        Graph.Graph(workload[0]).addEdges(workload[1])
+        return len(workload[1])
+
+    def bfs(directionOptimizing):
+        def run(G):
+            BreadthFirstPaths.BreadthFirstPaths(G, 0, directionOptimizing)
+            return G.V + G.E
+        return run
+
+    def dfs(G):
+        DepthFirstPaths.DepthFirstPaths(G, 0)
+        return G.V + G.E
+
+    def freeze(G):
+        G.freeze()
+        return G.V + G.E
+
+    def pointQuery(bidirectional):
+        def run(G):
+            for s, t in ((0, 1), (2, 3), (4, 5), (6, 7)):
+                BreadthFirstPaths.BreadthFirstPaths.shortestPath(G, s, t, bidirectional)
+            return 4
+        return run
+
+    def fullQuery(G):
+        for s, t in ((0, 1), (2, 3), (4, 5), (6, 7)):
+            BreadthFirstPaths.BreadthFirstPaths(G, s).pathTo(t)
+        return 4
+
+    def cc(G):
+        CC.CC(G)
+        return G.V + G.E
+
+    def reverse(G):
+        G.reverse()
+        G.reverse()
+        return G.V + G.E
+
+    params = graphParams(sparse)
+    result = [
+        Benchmark("graphs/addEdge/sparse", sparse, addEdgeLoop, params),
+        Benchmark("graphs/addEdges/sparse", sparse, addEdgesBulk, params),
+        Benchmark("graphs/freeze/sparse", lambda: _graph(sparse()), freeze, params),
+        Benchmark("graphs/cc/sparse", lambda: _graph(sparse()), cc, params),
+        Benchmark("graphs/reverse/sparse", lambda: _graph(sparse(), Digraph.Digraph), reverse, params),
+    ]
+    for label, workload in (("sparse", sparse), ("dense", dense), ("powerlaw", powerLaw)):
+        params = graphParams(workload)
+        result.append(Benchmark("graphs/bfs/" + label, lambda w=workload: _graph(w()), bfs(False), params))
+        result.append(Benchmark("graphs/bfs-diropt/" + label, lambda w=workload: _graph(w()), bfs(True), params))
+        result.append(Benchmark("graphs/bfs-csr/" + label, lambda w=workload: _graph(w()).freeze(), bfs(False), params))
+        result.append(Benchmark("graphs/dfs/" + label, lambda w=workload: _graph(w()), dfs, params))
+    for label, workload in (("sparse", sparse), ("powerlaw", powerLaw)):
+        params = graphParams(workload, queries=4)
+        result.append(Benchmark("graphs/pathTo/" + label, lambda w=workload: _graph(w()), fullQuery, params))
+        result.append(Benchmark("graphs/shortestPath/" + label, lambda w=workload: _graph(w()), pointQuery(False), params))
+        result.append(Benchmark("graphs/shortestPath-bidir/" + label, lambda w=workload: _graph(w()), pointQuery(True), params))
+    result.append(Benchmark("graphs/dfs/longpath", lambda: _graph(path()), dfs, {"V": V, "E": V - 1}))
+    result.append(Benchmark("graphs/bfs/longpath", lambda: _graph(path()), bfs(False), {"V": V, "E": V - 1}))
+    return result
+
+
+########################################################################
+# SORTING
+########################################################################
+
+@benchmarks
+def _pqBenchmarks(scale: int, seed: int):
+    n = 20000 * scale
+    result = []
+    for order in ("random", "ascending", "descending"):
+        keys = _lazy(Workloads.pqKeys, n, order, seed)
+        params = {"n": n, "order": order}
+
+        def maxInsertDelete(keys):
+            pq = MaxPQ.MaxPQ([])
+            for x in keys:
+                pq.insert(x)
+            while not pq.isEmpty():
+                pq.delMax()
+            return 2 * len(keys)
+
+        def minInsertDelete(keys):
+            pq = MinPQ.MinPQ([])
+            for x in keys:
+                pq.insert(x)
+            while not pq.isEmpty():
+                pq.delMin()
+            return 2 * len(keys)
+
+        def keyInsertDelete(keys):
+            pq = PQ.PQ([], key=abs, reverse=True)
+            for x in keys:
+                pq.insert(x)
+            while not pq.isEmpty():
+                pq.pop()
+            return 2 * len(keys)
+
+        def maxConstruct(keys):
+            MaxPQ.MaxPQ(keys)
+            return len(keys)
+
+        result.append(Benchmark("sorting/maxpq/insert-delMax/" + order, keys, maxInsertDelete, params))
+        result.append(Benchmark("sorting/minpq/insert-delMin/" + order, keys, minInsertDelete, params))
+        result.append(Benchmark("sorting/pq/insert-pop-key/" + order, keys, keyInsertDelete, params))
+        result.append(Benchmark("sorting/maxpq/construct/" + order, keys, maxConstruct, params))
+
+    keys = _lazy(Workloads.pqKeys, n, "random", seed)
+
+    def keysDesc(pq):
+        pq.keysDesc()
+        return pq.size()
+
+    result.append(Benchmark("sorting/maxpq/keysDesc/random", lambda: MaxPQ.MaxPQ(keys()), keysDesc, {"n": n}))
+
+    def nlargest(pq):
+        for _ in range(100):
+            pq.nlargest(10)
+        return 100
+
+    result.append(Benchmark("sorting/maxpq/nlargest-10/random", lambda: MaxPQ.MaxPQ(keys()), nlargest, {"n": n, "k": 10}))
+
+    # Dijkstra-style workload: every index is inserted, then its key is
+    # lowered a few times before the index is removed
+    updates = _lazy(Workloads.pqUpdates, n, 4 * n, seed)
+
+    def indexDecreaseKey(updates):
+        pq = IndexMinPQ.IndexMinPQ(n)
+        for i in range(n):
+            pq.insert(i, 1.0)
+        for i, key in updates:
+            if key < pq.keyOf(i):
+                pq.decreaseKey(i, key)
+        while not pq.isEmpty():
+            pq.delMin()
+        return 2 * n + len(updates)
+
+    def lazyDecreaseKey(updates):
+        best = [1.0] * n
+        pq = MinPQ.MinPQ([(1.0, i) for i in range(n)])
+        for i, key in updates:
+            if key < best[i]:
+                best[i] = key
+                pq.insert((key, i))
+        while not pq.isEmpty():
+            pq.delMin()
+        return 2 * n + len(updates)
+
+    result.append(Benchmark("sorting/indexminpq/decreaseKey/random", updates, indexDecreaseKey, {"n": n, "updates": 4 * n}))
+    result.append(Benchmark("sorting/minpq/lazy-decreaseKey/random", updates, lazyDecreaseKey, {"n": n, "updates": 4 * n}))
+    return result
+
+
+@benchmarks
+def _heapBackendBenchmarks(scale: int, seed: int):
+    n = 20000 * scale
+    keys = _lazy(Workloads.pqKeys, n, "random", seed)
+    updates = _lazy(Workloads.pqUpdates, n, 4 * n, seed)
+    backends = (("binary", 2), ("dary", 2), ("dary", 4), ("dary", 8), ("pairing", 2))
+    result = []
+    for backend, d in backends:
+        label = backend if backend != "dary" else "dary-" + str(d)
+        params = {"n": n, "backend": backend, "d": d}
+
+        def insertPop(keys, backend=backend, d=d):
+            pq = PQ.PQ([], backend=backend, d=d)
+            for x in keys:
+                pq.insert(x)
+            while not pq.isEmpty():
+                pq.pop()
+            return 2 * len(keys)
+
+        # schedulers: many inserts, few removals
+        def insertHeavy(keys, backend=backend, d=d):
+            pq = PQ.PQ([], backend=backend, d=d)
+            for i, x in enumerate(keys):
+                pq.insert(x)
+                if i % 16 == 15:
+                    pq.pop()
+            return len(keys) + len(keys) // 16
+
+        # 100 queues of n/100 keys each, melded into one
+        def meld(queues):
+            pq = queues[0]
+            for other in queues[1:]:
+                pq.meld(other)
+            pq.pop()
+            return len(queues)
+
+        def queues(backend=backend, d=d):
+            size = n // 100
+            return [PQ.PQ(keys()[i:i + size], backend=backend, d=d) for i in range(0, 100 * size, size)]
+
+        result.append(Benchmark("sorting/pq-backend/insert-pop/" + label, keys, insertPop, params))
+        result.append(Benchmark("sorting/pq-backend/insert-heavy/" + label, keys, insertHeavy, params))
+        result.append(Benchmark("sorting/pq-backend/meld/" + label, queues, meld, params))
+
+    # Dijkstra-style workload: the pairing heap lowers queued keys in
+    # place, the binary heap inserts duplicates and skips stale ones
+    def pairingDecreaseKey(updates):
+        pq = PQ.PQ([], backend="pairing")
+        handles = [pq.insert((1.0, i)) for i in range(n)]
+        for i, key in updates:
+            if key < handles[i].entry[0]:
+                pq.decreaseKey(handles[i], (key, i))
+        while not pq.isEmpty():
+            pq.pop()
+        return 2 * n + len(updates)
+
+    def binaryLazyDecreaseKey(updates):
+        best = [1.0] * n
+        pq = PQ.PQ([(1.0, i) for i in range(n)])
+        for i, key in updates:
+            if key < best[i]:
+                best[i] = key
+                pq.insert((key, i))
+        while not pq.isEmpty():
+            pq.pop()
+        return 2 * n + len(updates)
+
+    params = {"n": n, "updates": 4 * n}
+    result.append(Benchmark("sorting/pq-backend/decreaseKey/pairing", updates, pairingDecreaseKey, params))
+    result.append(Benchmark("sorting/pq-backend/decreaseKey/binary-lazy", updates, binaryLazyDecreaseKey, params))
+    return result
+
+
+########################################################################
+# STRINGS
+########################################################################
+
+@benchmarks
+def _stringBenchmarks(scale: int, seed: int):
+    n = 200000 * scale
+    text = _lazy(Workloads.randomText, n, "abcd", seed)
+    pattern = _lazy(Workloads.randomText, 100, "abcd", seed + 1)
+    adversarial = _lazy(Workloads.adversarialText, n, 100)
+    longPattern = _lazy(Workloads.randomText, 2000, seed=seed + 2)
+
+    def kmpSearch(args):
+        kmp, txt = args
+        kmp.search(txt)
+        return len(txt)
+
+    def kmpConstruct(mode):
+        def run(pat):
+            KMP.KMP(pat, mode)
+            return len(pat)
+        return run
+
+    def kmpStream(args):
+        kmp, txt = args
+        for _ in kmp.searchStream(txt[i:i + 4096] for i in range(0, len(txt), 4096)):
+            pass
+        return len(txt)
+
+    result = []
+    for mode in KMP.KMP.MODES:
+        result.append(Benchmark("strings/kmp-" + mode + "/searchStream/random", lambda m=mode: (KMP.KMP(pattern(), m), text()), kmpStream, {"n": n, "m": 100, "chunk": 4096}))
+        result.append(Benchmark("strings/kmp-" + mode + "/construct/m=2000", longPattern, kmpConstruct(mode), {"m": 2000}))
+        result.append(Benchmark("strings/kmp-" + mode + "/search/random", lambda m=mode: (KMP.KMP(pattern(), m), text()), kmpSearch, {"n": n, "m": 100}))
+        result.append(Benchmark("strings/kmp-" + mode + "/search/adversarial", lambda m=mode: (KMP.KMP(adversarial()[1], m), adversarial()[0]), kmpSearch, {"n": n, "m": 100}))
+
+    hotPatterns = _lazy(lambda: Workloads.zipfKeys(5000, Workloads.randomKeys(300, 20, seed=seed), seed=seed))
+    shortText = _lazy(Workloads.randomText, 200, seed=seed)
+
+    def perRequest(compiled):
+        def run(args):
+            patterns, txt = args
+            for pat in patterns:
+                matcher = KMP.compile(pat) if compiled else KMP.KMP(pat)
+                matcher.search(txt)
+            return len(patterns)
+        return run
+
+    def coldCache(patterns):
+        KMP.clearCache()
+        return patterns
+
+    result.append(Benchmark("strings/kmp/per-request/construct", lambda: (hotPatterns(), shortText()), perRequest(False), {"requests": 5000, "patterns": 300}))
+    result.append(Benchmark("strings/kmp/per-request/compile", lambda: (coldCache(hotPatterns()), shortText()), perRequest(True), {"requests": 5000, "patterns": 300}))
+
+    def buildKeywordTrie():
+        st = TrieST.TrieST()
+        for i, key in enumerate(Workloads.randomKeys(1000, 6, "abcd", seed)):
+            st.put(key, i)
+        return st
+
+    keywordTrie = _lazy(buildKeywordTrie)
+
+    def ahoCorasick(args):
+        ac, txt = args
+        ac.search(txt)
+        return len(txt)
+
+    result.append(Benchmark("strings/ahocorasick/search/1000-keys", lambda: (AhoCorasick.AhoCorasick(keywordTrie()), text()), ahoCorasick, {"n": n, "keys": 1000}))
+
+    k = 20000 * scale
+    for label, keys in (("random", _lazy(Workloads.randomKeys, k, seed=seed)), ("urls", _lazy(Workloads.urlKeys, k, seed))):
+        queries = _lazy(lambda keys=keys: Workloads.zipfKeys(k, keys() + Workloads.randomKeys(k, seed=seed + 3), seed=seed))
+        params = {"keys": k, "queries": k}
+
+        def put(keys, cls=TrieST.TrieST):
+            st = cls()
+            for i, key in enumerate(keys):
+                st.put(key, i)
+            return len(keys)
+
+        def get(args):
+            st, queries = args
+            for q in queries:
+                st.get(q)
+            return len(queries)
+
+        def prefix(args):
+            st, queries = args
+            for q in queries[:100]:
+                st.keysWithPrefix(q[:len(q) // 2])
+            return 100
+
+        def completions(method):
+            def run(args):
+                st, queries = args
+                for q in queries[:1000]:
+                    method(st, q[:3], 10)
+                return 1000
+            return run
+
+        def ranked(keys):
+            st = trie(keys)
+            st.rank() # annotate the nodes outside the timed region
+            return st
+
+        def trie(keys, cls=TrieST.TrieST):
+            st = cls()
+            for i, key in enumerate(keys):
+                st.put(key, i)
+            return st
+
+        result.append(Benchmark("strings/triest/put/" + label, keys, put, params))
+        result.append(Benchmark("strings/triest/get/" + label, lambda k=keys, q=queries: (trie(k()), q()), get, params))
+        result.append(Benchmark("strings/triest/keysWithPrefix/" + label, lambda k=keys, q=queries: (trie(k()), q()), prefix, params))
+        result.append(Benchmark("strings/triest/keysWithPrefix-limit/" + label, lambda k=keys, q=queries: (trie(k()), q()), completions(TrieST.TrieST.keysWithPrefix), dict(params, limit=10)))
+        result.append(Benchmark("strings/triest/topKeysWithPrefix/" + label, lambda k=keys, q=queries: (ranked(k()), q()), completions(TrieST.TrieST.topKeysWithPrefix), dict(params, k=10)))
+        result.append(Benchmark("strings/triest/freeze/" + label, lambda k=keys: trie(k()), lambda st: st.freeze().size(), params))
+        result.append(Benchmark("strings/frozentriest/get/" + label, lambda k=keys, q=queries: (trie(k()).freeze(), q()), get, params))
+        result.append(Benchmark("strings/frozentriest/keysWithPrefix/" + label, lambda k=keys, q=queries: (trie(k()).freeze(), q()), prefix, params))
+        result.append(Benchmark("strings/radixtriest/put/" + label, keys, lambda k: put(k, RadixTrieST.RadixTrieST), params))
+        result.append(Benchmark("strings/radixtriest/get/" + label, lambda k=keys, q=queries: (trie(k(), RadixTrieST.RadixTrieST), q()), get, params))
+        result.append(Benchmark("strings/radixtriest/keysWithPrefix/" + label, lambda k=keys, q=queries: (trie(k(), RadixTrieST.RadixTrieST), q()), prefix, params))
+    return result
+
+
+########################################################################
+# Command line
+########################################################################
+
+"""
+Runs the registered benchmarks whose name contains the filter.
+:param scale: the workload size multiplier
+:param seed: the random seed of the workloads
+:param repeat: the number of timed runs per benchmark
+:param nameFilter: only run the benchmarks whose name contains it
+:returns: the JSON-serializable report
+"""
+def runAll(scale: int = 1, seed: int = 0, repeat: int = 3, nameFilter: str = ""):
+    results = []
+    for factory in _factories:
+        for bench in factory(scale, seed):
+            if nameFilter in bench.name:
+                result = bench.measure(repeat)
+                results.append(result)
+                _printResult(result)
+    return {
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def _printResult(result: dict):
+    opsPerSec = result["opsPerSec"] or 0
+    print("%-45s %10.4f s %14.0f ops/s %10.1f KiB" % (result["name"], result["seconds"], opsPerSec, result["peakBytes"] / 1024))
+    sys.stdout.flush()
+
+"""
+Prints the ratio of the best times of the benchmarks two reports share.
+:param before: the path of the baseline report
+:param after: the path of the new report
+"""
+def compare(before: str, after: str):
+    with open(before) as f:
+        old = {r["name"]: r for r in json.load(f)["results"]}
+    with open(after) as f:
+        new = {r["name"]: r for r in json.load(f)["results"]}
+    for name in sorted(old.keys() & new.keys()):
+        speedup = old[name]["seconds"] / new[name]["seconds"] if new[name]["seconds"] > 0 else float("inf")
+        memory = new[name]["peakBytes"] / old[name]["peakBytes"] if old[name]["peakBytes"] > 0 else float("inf")
+        print("%-45s %8.2fx faster %8.2fx memory" % (name, speedup, memory))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the Algs4 data structures.")
+    parser.add_argument("--scale", type=int, default=1, help="workload size multiplier")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the workloads")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", default="bench_results.json", help="path of the JSON report")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON reports")
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    report = runAll(args.scale, args.seed, args.repeat, args.filter)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("results saved to " + args.output)
+
+if __name__ == "__main__":
+    main()
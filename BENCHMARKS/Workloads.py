@@ -0,0 +1,171 @@
+import random
+import string
+
+"""
+Seeded synthetic workload generators for the benchmarks.
+
+Every generator takes a seed and builds its own random.Random from it,
+so the same arguments always produce the same workload, independently
+of the order in which the benchmarks run.
+Graph generators return the number of vertices and a list of (v, w)
+edges, which the benchmarks feed to Graph, Digraph or their bulk
+constructors.
+"""
+
+
+"""
+Returns a uniformly random sparse or dense graph.
+:param V: the number of vertices
+:param E: the number of edges
+:param seed: the random seed
+:returns: the tuple (V, edges)
+"""
+def randomGraph(V: int, E: int, seed: int = 0):
+    rnd = random.Random(seed)
+    return V, [(rnd.randrange(V), rnd.randrange(V)) for _ in range(E)]
+
+
+"""
+Returns a power-law graph grown by preferential attachment
+(Barabasi-Albert): each new vertex is joined to m earlier vertices
+picked with probability proportional to their degree.
+:param V: the number of vertices
+:param m: the number of edges added with each new vertex
+:param seed: the random seed
+:returns: the tuple (V, edges)
+"""
+def powerLawGraph(V: int, m: int, seed: int = 0):
+    rnd = random.Random(seed)
+    edges = []
+    ends = [] # every endpoint of every edge so far, so degree-weighted picks are uniform picks
+    for v in range(min(m, V)):
+        for w in range(v):
+            edges.append((v, w))
+            ends.extend((v, w))
+    for v in range(m, V):
+        targets = set()
+        while len(targets) < m:
+            targets.add(ends[rnd.randrange(len(ends))] if ends else rnd.randrange(v))
+        for w in targets:
+            edges.append((v, w))
+            ends.extend((v, w))
+    return V, edges
+
+
+"""
+Returns a path 0-1-2-...-(V-1), the worst case for the depth of a
+depth-first search.
+:param V: the number of vertices
+:returns: the tuple (V, edges)
+"""
+def longPathGraph(V: int):
+    return V, [(v, v + 1) for v in range(V - 1)]
+
+
+"""
+Returns a random text over the given alphabet.
+:param n: the length of the text
+:param alphabet: the characters to draw from
+:param seed: the random seed
+:returns: the text
+"""
+def randomText(n: int, alphabet: str = string.ascii_lowercase, seed: int = 0):
+    rnd = random.Random(seed)
+    return "".join(rnd.choices(alphabet, k=n))
+
+
+"""
+Returns a text and a pattern that make substring search back up as much
+as possible: the pattern is a^(m-1)b and the text is a long run of a's
+with a b at the very end, so the only match is the last m characters.
+:param n: the length of the text
+:param m: the length of the pattern
+:returns: the tuple (text, pattern)
+"""
+def adversarialText(n: int, m: int):
+    return "a" * (n - 1) + "b", "a" * (m - 1) + "b"
+
+
+"""
+Returns distinct random keys for the string symbol tables.
+:param n: the number of keys
+:param length: the length of each key
+:param alphabet: the characters to draw from
+:param seed: the random seed
+:returns: the list of keys
+"""
+def randomKeys(n: int, length: int = 10, alphabet: str = string.ascii_lowercase, seed: int = 0):
+    rnd = random.Random(seed)
+    keys = {} # a dict, not a set, so the keys keep the order they were drawn in
+    while len(keys) < n:
+        keys["".join(rnd.choices(alphabet, k=length))] = None
+    keys = list(keys)
+    rnd.shuffle(keys)
+    return keys
+
+
+"""
+Returns distinct URL-like keys that share long prefixes and branch
+rarely, as in a dictionary of URLs or file paths.
+:param n: the number of keys
+:param seed: the random seed
+:returns: the list of keys
+"""
+def urlKeys(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    hosts = ["https://www." + randomText(8, seed=seed + i) + ".com/" for i in range(8)]
+    dirs = ["static/assets/", "api/v1/users/", "api/v2/orders/", "docs/reference/"]
+    keys = {} # a dict, not a set, so the keys keep the order they were drawn in
+    while len(keys) < n:
+        keys[rnd.choice(hosts) + rnd.choice(dirs) + "".join(rnd.choices(string.ascii_lowercase + string.digits, k=12))] = None
+    keys = list(keys)
+    rnd.shuffle(keys)
+    return keys
+
+
+"""
+Returns n keys drawn from a Zipf-like distribution over a vocabulary of
+the given size, the usual shape of query traffic: a few keys repeat very
+often and most keys are rare.
+:param n: the number of keys
+:param vocabulary: the list of distinct keys to draw from
+:param s: the exponent of the distribution
+:param seed: the random seed
+:returns: the list of keys
+"""
+def zipfKeys(n: int, vocabulary: list, s: float = 1.1, seed: int = 0):
+    rnd = random.Random(seed)
+    weights = [1.0 / (r + 1) ** s for r in range(len(vocabulary))]
+    return rnd.choices(vocabulary, weights=weights, k=n)
+
+
+"""
+Returns n integer keys for the priority queues in the given order.
+:param n: the number of keys
+:param order: "random", "ascending" or "descending"
+:param seed: the random seed
+:returns: the list of keys
+"""
+def pqKeys(n: int, order: str = "random", seed: int = 0):
+    rnd = random.Random(seed)
+    keys = [rnd.randrange(1 << 30) for _ in range(n)]
+    if order == "ascending":
+        keys.sort()
+    elif order == "descending":
+        keys.sort(reverse=True)
+    elif order != "random":
+        raise ValueError("unknown key order " + order)
+    return keys
+
+
+"""
+Returns a Dijkstra-style sequence of priority updates: random indices,
+each paired with a random candidate key in [0, 1).
+:param n: the number of indices
+:param m: the number of updates
+:param seed: the random seed
+:returns: the list of (index, key) pairs
+"""
+def pqUpdates(n: int, m: int, seed: int = 0):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(n), rnd.random()) for _ in range(m)]
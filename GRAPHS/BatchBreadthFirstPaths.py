@@ -0,0 +1,176 @@
+import math
+import os
+from array import array
+from collections import deque
+from multiprocessing import Pool, shared_memory
+import Graph
+import CSRGraph
+
+"""
+Dependencies: Graph.py, CSRGraph.py
+
+Execution:
+G = Graph.Graph(6)
+G.addEdges([(0, 2), (0, 1), (0, 5), (1, 2), (3, 2), (4, 2), (3, 4), (3, 5)])
+
+batch = BatchBreadthFirstPaths(G, [0, 3], processes=2)
+
+for i in range(len(batch.sources)):
+    print(batch.row(i).tolist())
+
+"""
+
+"""
+The BatchBreadthFirstPaths class computes the shortest path distances
+(number of edges) from each one of many source vertices to every other
+vertex in an undirected graph.
+
+The graph is frozen into compressed sparse row form and its two arrays
+are copied once into shared memory. A pool of worker processes maps
+the shared arrays read-only and runs one breadth-first search per
+source, writing its distances straight into a shared k-by-V matrix of
+32-bit integers, so neither the graph nor the results are pickled.
+
+The constructor takes time proportional to k(V + E), spread over the
+worker processes, where k is the number of sources.
+The distance matrix uses 4kV bytes, and unreachable vertices are
+stored as UNREACHABLE.
+Each call to #distTo(int, int) and #hasPathTo(int, int) takes constant
+time.
+"""
+class BatchBreadthFirstPaths(object):
+    UNREACHABLE = -1
+
+    """
+    Computes the shortest path distances from each source vertex.
+    :param G: the graph, either a Graph or a CSRGraph from Graph.freeze()
+    :param sources: the source vertices, one row of distances per source
+    :param processes: the number of worker processes; defaults to the
+    number of CPUs, and 1 runs every search in this process
+    :raises IndexError: unless 0 <= s < V for each source vertex s
+    """
+    def __init__(self, G: Graph, sources, processes: int = None):
+        csr = G if isinstance(G, CSRGraph.CSRGraph) else G.freeze()
+        self.V = csr.V
+        self.sources = list(sources)
+        for s in self.sources:
+            csr.validateVertex(s)
+        k = len(self.sources)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = max(1, min(processes, k))
+
+        if processes == 1:
+            self.dist = array('i', bytes(4 * k * self.V))
+            for i in range(k):
+                _bfs(csr.offsets, csr.targets, self.V, self.sources[i], self.dist, i * self.V)
+        else:
+            self.dist = self._parallel(csr, processes)
+
+    # run the searches in a process pool over shared copies of the graph
+    def _parallel(self, csr: CSRGraph, processes: int):
+        V = self.V
+        k = len(self.sources)
+        segments = []
+        try:
+            offsets = _share(memoryview(csr.offsets).cast('B'), segments)
+            targets = _share(memoryview(csr.targets).cast('B'), segments)
+            out = _share(4 * k * V, segments)
+            sizes = (8 * (V + 1), 4 * len(csr.targets), 4 * k * V)
+            names = [(shm.name, size) for shm, size in zip(segments, sizes)]
+            with Pool(processes, _attach, (names, V)) as pool:
+                tasks = list(enumerate(self.sources))
+                pool.map(_task, tasks, max(1, len(tasks) // (4 * processes)))
+            dist = array('i')
+            dist.frombytes(out.buf[:4 * k * V])
+            return dist
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    """
+    Returns the distances from the i-th source vertex to every vertex.
+    :param i: the index of the source vertex in sources
+    :returns: a memoryview of V distances, with UNREACHABLE for the
+    vertices not connected to the source
+    """
+    def row(self, i: int):
+        return memoryview(self.dist)[i * self.V:(i + 1) * self.V]
+
+    """
+    Returns the number of edges in a shortest path between the i-th
+    source vertex and vertex v.
+    :param i: the index of the source vertex in sources
+    :param v: the vertex
+    :returns: the number of edges in a shortest path, or math.inf if
+    there is no such path
+    :raises IndexError: unless 0 <= v < V
+    """
+    def distTo(self, i: int, v: int):
+        self.validateVertex(v)
+        d = self.dist[i * self.V + v]
+        if d == self.UNREACHABLE:
+            return math.inf
+        return d
+
+    """
+    Is there a path between the i-th source vertex and vertex v?
+    :param i: the index of the source vertex in sources
+    :param v: the vertex
+    :returns: True if there is a path, and False otherwise
+    :raises IndexError: unless 0 <= v < V
+    """
+    def hasPathTo(self, i: int, v: int):
+        self.validateVertex(v)
+        return self.dist[i * self.V + v] != self.UNREACHABLE
+
+    # raise an IndexError unless 0 <= v < V
+    def validateVertex(self, v: int):
+        if v < 0 or v >= self.V:
+            raise IndexError("vertex ", v, " is not between 0 and ", (self.V-1))
+
+
+# breadth-first search from s over the CSR arrays, writing the
+# distance of each vertex v to dist[base + v]
+def _bfs(offsets, targets, V: int, s: int, dist, base: int):
+    for v in range(base, base + V):
+        dist[v] = BatchBreadthFirstPaths.UNREACHABLE
+    dist[base + s] = 0
+    q = deque([s])
+    while q:
+        v = q.popleft()
+        d = dist[base + v] + 1
+        for j in range(offsets[v], offsets[v + 1]):
+            w = targets[j]
+            if dist[base + w] < 0:
+                dist[base + w] = d
+                q.append(w)
+
+
+# create a shared memory segment holding a copy of data, or size zero bytes
+def _share(data, segments: list):
+    size = data if isinstance(data, int) else len(data)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    segments.append(shm)
+    if not isinstance(data, int):
+        shm.buf[:size] = data
+    return shm
+
+
+# per-worker views of the shared segments, set up by _attach
+_worker = {}
+
+def _attach(names: list, V: int):
+    segments = [shared_memory.SharedMemory(name=name) for name, _ in names]
+    views = [shm.buf[:size] for shm, (_, size) in zip(segments, names)]
+    _worker["segments"] = segments
+    _worker["offsets"] = views[0].cast('q')
+    _worker["targets"] = views[1].cast('i')
+    _worker["out"] = views[2].cast('i')
+    _worker["V"] = V
+
+def _task(task):
+    i, s = task
+    V = _worker["V"]
+    _bfs(_worker["offsets"], _worker["targets"], V, s, _worker["out"], i * V)
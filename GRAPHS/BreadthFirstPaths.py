@@ -1,4 +1,5 @@
 import math
+from collections import deque
 import Graph
 
 """
@@ -27,52 +28,74 @@ for w in range(1, V):
 """
 The BreadthFirstPaths class represents a data type for finding
 shortest paths (number of edges) from a source vertex s (or a set 
-of source vertices) to every other vertex in an undirected graph.
+of source vertices) to every other vertex in a graph or a digraph.
 
 This implementation uses breadth-first search.
 The constructor takes time proportional to V + E, where V is the 
 number of vertices and E is the number of edges.
+Optionally, the search is direction-optimizing: levels whose frontier
+is large are expanded bottom-up, by letting each unvisited vertex look
+for a parent in the frontier among its in-neighbours (its neighbours,
+in an undirected graph), which examines far fewer edges on graphs with
+a small diameter.
 Each call to #distTo(int) and #hasPathTo(int) takes constant time;
 each call to #pathTo(int) takes time proportional to the length
 of the path.
 It uses extra space (not including the graph) proportional to V.
+
+The static methods search, levels and shortestPath explore the graph
+lazily instead: they keep their state in dictionaries and stop as soon
+as the caller stops asking, so a query that ends early costs time and
+space proportional to the part of the graph it explored, not to V + E.
 """
 class BreadthFirstPaths(object):
+    ALPHA = 14 # switch to bottom-up once the frontier has more than 1/ALPHA of the unexplored edges
+    BETA = 24  # switch back to top-down once the frontier has fewer than V/BETA vertices
+
     # private static final int INFINITY = Integer.MAX_VALUE;
     # private boolean[] marked;  // marked[v] = is there an s-v path
     # private int[] edgeTo;      // edgeTo[v] = previous edge on shortest s-v path
     # private int[] distTo;      // distTo[v] = number of edges shortest s-v path
 
     """
-    Computes the shortest path between the source vertex s
+    Computes the shortest path between the source vertex s (or any
+    one of the source vertices, if s is a collection of vertices)
     and every other vertex in the graph G.
-    :param G: the graph
-    :param s: the source vertex
-    :raises IndexError: unless 0 <= s < V
-    :raises IndexError: unless 0 <= s < V
+    :param G: the graph, a Graph, a Digraph or a CSRGraph from freeze()
+    :param s: the source vertex, or an iterable of source vertices
+    :param directionOptimizing: True to switch between top-down and
+    bottom-up sweeps depending on the size of the frontier
+    :raises IndexError: unless 0 <= s < V for each source vertex s
+    :raises ValueError: if s is an empty collection of vertices
     """
-    def __init__(self, G: Graph, s: int):
+    def __init__(self, G: Graph, s, directionOptimizing: bool = False):
         self.marked = [False for i in range(G.V)]
         self.distTo = [0 for i in range(G.V)]
         self.edgeTo = [0 for i in range(G.V)]
-        self.validateVertex(s)
-        self._bfs(G, s)
+        sources = [s] if isinstance(s, int) else list(s)
+        self.validateVertices(sources)
+        if directionOptimizing:
+            self._bfsDirectionOptimizing(G, sources)
+        else:
+            self._bfs(G, sources)
 
-        assert self.check(G, s)
+        assert self.check(G, sources)
 
 
 
-    # breadth-first search from a single source
-    def _bfs(self, G: Graph, s: int):
-        q = []
+    # breadth-first search from multiple sources
+    def _bfs(self, G: Graph, sources: list):
+        q = deque()
         for v in range(G.V):
             self.distTo[v] = math.inf
-        self.distTo[s] = 0
-        self.marked[s] = True
-        q.append(s)
+        for s in sources:
+            if not self.marked[s]:
+                self.distTo[s] = 0
+                self.marked[s] = True
+                q.append(s)
 
         while q:
-            v = q.pop(0)
+            v = q.popleft()
             for w in G.adj[v]:
                 if not self.marked[w]:
                     self.edgeTo[w] = v
@@ -80,6 +103,219 @@ class BreadthFirstPaths(object):
                     self.marked[w] = True
                     q.append(w)
 
+    # level-synchronous breadth-first search that expands each level
+    # either top-down (from the frontier) or bottom-up (from the
+    # unvisited vertices), following Beamer, Asanovic and Patterson;
+    # bottom-up, a vertex looks for its parent among its in-neighbours,
+    # which are its neighbours in an undirected graph
+    def _bfsDirectionOptimizing(self, G: Graph, sources: list):
+        V = G.V
+        adj = G.adj
+        inAdj = G.reverse().adj if hasattr(G, "reverse") else adj
+        marked = self.marked
+        distTo = self.distTo
+        edgeTo = self.edgeTo
+        for v in range(V):
+            distTo[v] = math.inf
+        frontier = []
+        for s in sources:
+            if not marked[s]:
+                distTo[s] = 0
+                marked[s] = True
+                frontier.append(s)
+
+        unexploredEdges = 0
+        for v in range(V):
+            if not marked[v]:
+                unexploredEdges += len(inAdj[v])
+        bottomUp = False
+        level = 0
+        while frontier:
+            if bottomUp:
+                bottomUp = len(frontier) >= V / self.BETA
+            else:
+                frontierEdges = 0
+                for v in frontier:
+                    frontierEdges += len(adj[v])
+                bottomUp = frontierEdges > unexploredEdges / self.ALPHA
+
+            nextFrontier = []
+            if bottomUp:
+                for v in range(V):
+                    if marked[v]:
+                        continue
+                    for w in inAdj[v]:
+                        if distTo[w] == level:
+                            edgeTo[v] = w
+                            distTo[v] = level + 1
+                            marked[v] = True
+                            nextFrontier.append(v)
+                            break
+            else:
+                for v in frontier:
+                    for w in adj[v]:
+                        if not marked[w]:
+                            edgeTo[w] = v
+                            distTo[w] = level + 1
+                            marked[w] = True
+                            nextFrontier.append(w)
+
+            for v in nextFrontier:
+                unexploredEdges -= len(inAdj[v])
+            frontier = nextFrontier
+            level += 1
+
+
+    """
+    Generates the vertices reachable from the source vertex s (or from
+    any one of the source vertices) in breadth-first order, as triples
+    (v, distance, parent), where parent is the previous vertex on a
+    shortest path, or None for a source vertex. The search runs only as
+    far as the generator is consumed.
+    :param G: the graph, a Graph, a Digraph or a CSRGraph
+    :param s: the source vertex, or an iterable of source vertices
+    :returns: a generator over (vertex, distance, parent) triples
+    :raises IndexError: unless 0 <= s < V for each source vertex s
+    """
+    @staticmethod
+    def search(G: Graph, s):
+        return BreadthFirstPaths._search(G, BreadthFirstPaths._sources(G, s))
+
+    # the generator of search(), over the validated source vertices, so
+    # that a bad source raises when search is called
+    @staticmethod
+    def _search(G: Graph, sources: list):
+        adj = G.adj
+        distTo = {}
+        q = deque()
+        for v in sources:
+            if v not in distTo:
+                distTo[v] = 0
+                q.append(v)
+                yield v, 0, None
+        while q:
+            v = q.popleft()
+            d = distTo[v] + 1
+            for w in adj[v]:
+                if w not in distTo:
+                    distTo[w] = d
+                    q.append(w)
+                    yield w, d, v
+
+    """
+    Generates the levels of a breadth-first search from the source
+    vertex s (or from the source vertices): the list of vertices at
+    distance 0, then the list at distance 1, and so on. Each level is
+    computed only when it is requested.
+    :param G: the graph, a Graph, a Digraph or a CSRGraph
+    :param s: the source vertex, or an iterable of source vertices
+    :returns: a generator over the lists of vertices at each distance
+    :raises IndexError: unless 0 <= s < V for each source vertex s
+    """
+    @staticmethod
+    def levels(G: Graph, s):
+        return BreadthFirstPaths._levels(G, BreadthFirstPaths._sources(G, s))
+
+    # the generator of levels(), over the validated source vertices
+    @staticmethod
+    def _levels(G: Graph, sources: list):
+        adj = G.adj
+        frontier = list(dict.fromkeys(sources))
+        seen = set(frontier)
+        while frontier:
+            yield frontier
+            nextFrontier = []
+            for v in frontier:
+                for w in adj[v]:
+                    if w not in seen:
+                        seen.add(w)
+                        nextFrontier.append(w)
+            frontier = nextFrontier
+
+    """
+    Returns a shortest path between vertices s and t, stopping the
+    search as soon as t is reached.
+    The bidirectional search grows a ball around s and a ball around t,
+    always expanding the smaller frontier by one level, and stops as
+    soon as the balls touch; on a digraph the ball around t follows the
+    edges backwards, through G.reverse().
+    :param G: the graph, a Graph, a Digraph or a CSRGraph
+    :param s: the source vertex
+    :param t: the target vertex
+    :param bidirectional: True to search from both s and t
+    :returns: the sequence of vertices on a shortest path, as a list,
+    or None if there is no such path
+    :raises IndexError: unless 0 <= s < V and 0 <= t < V
+    """
+    @staticmethod
+    def shortestPath(G: Graph, s: int, t: int, bidirectional: bool = False):
+        G.validateVertex(s)
+        G.validateVertex(t)
+        if s == t:
+            return [s]
+        if bidirectional:
+            return BreadthFirstPaths._bidirectionalPath(G, s, t)
+        edgeTo = {s: None}
+        q = deque([s])
+        while q:
+            v = q.popleft()
+            for w in G.adj[v]:
+                if w not in edgeTo:
+                    edgeTo[w] = v
+                    if w == t:
+                        return BreadthFirstPaths._chain(edgeTo, t)[::-1]
+                    q.append(w)
+        return None
+
+    # bidirectional breadth-first search between s != t
+    @staticmethod
+    def _bidirectionalPath(G: Graph, s: int, t: int):
+        forwardAdj = G.adj
+        backwardAdj = G.reverse().adj if hasattr(G, "reverse") else G.adj
+        edgeTo = ({s: None}, {t: None}) # shortest path trees from s and (backwards) from t
+        distTo = ({s: 0}, {t: 0})
+        frontiers = [[s], [t]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            adj = forwardAdj if side == 0 else backwardAdj
+            parent = edgeTo[side]
+            dist = distTo[side]
+            otherDist = distTo[1 - side]
+            best = None # (length, v, w) of the shortest s-t path through edge v-w found so far
+            nextFrontier = []
+            for v in frontiers[side]:
+                d = dist[v] + 1
+                for w in adj[v]:
+                    if w not in parent:
+                        parent[w] = v
+                        dist[w] = d
+                        nextFrontier.append(w)
+                    if w in otherDist and (best is None or d + otherDist[w] < best[0]):
+                        best = (d + otherDist[w], v, w)
+            if best is not None:
+                _, v, w = best
+                if side == 1:
+                    v, w = w, v
+                return BreadthFirstPaths._chain(edgeTo[0], v)[::-1] + BreadthFirstPaths._chain(edgeTo[1], w)
+            frontiers[side] = nextFrontier
+        return None
+
+    # the vertices from v up to the root of the tree given by edgeTo
+    @staticmethod
+    def _chain(edgeTo: dict, v: int):
+        path = []
+        while v is not None:
+            path.append(v)
+            v = edgeTo[v]
+        return path
+
+    # the source vertices s, validated
+    @staticmethod
+    def _sources(G: Graph, s):
+        sources = [s] if isinstance(s, int) else list(s)
+        for v in sources:
+            G.validateVertex(v)
+        return sources
 
     """
     Is there a path between the source vertex s and vertex v?
@@ -122,18 +358,20 @@ class BreadthFirstPaths(object):
         path.reverse()
         return path
 
-    # check optimality conditions for single source
-    def check(self, G: Graph, s: int):
-        # check that the distance of s = 0
-        if self.distTo[s] != 0:
-            print("distance of source ", s, " to itself = ", self.distTo[s])
-            return False
+    # check optimality conditions for the source vertices
+    def check(self, G: Graph, sources: list):
+        # check that the distance of each source s = 0
+        for s in sources:
+            if self.distTo[s] != 0:
+                print("distance of source ", s, " to itself = ", self.distTo[s])
+                return False
 
         # check that for each edge v-w dist[w] <= dist[v] + 1
-        # provided v is reachable from s
+        # provided v is reachable from s (an undirected edge is checked
+        # in both directions, since it is in both adjacency lists)
         for v in range(G.V):
             for w in  G.adj[v]:
-                if self.hasPathTo(v) != self.hasPathTo(w):
+                if self.hasPathTo(v) and not self.hasPathTo(w):
                     print("edge ", v, "-", w)
                     print("hasPathTo(", v, ") = ", self.hasPathTo(v))
                     print("hasPathTo(", w, ") = ", self.hasPathTo(w))
@@ -146,7 +384,7 @@ class BreadthFirstPaths(object):
         # check that v = edgeTo[w] satisfies distTo[w] = distTo[v] + 1
         # provided v is reachable from s
         for w in range(G.V):
-            if not self.hasPathTo(w) or w == s:
+            if not self.hasPathTo(w) or self.distTo[w] == 0:
                  continue
             v = self.edgeTo[w]
             if self.distTo[w] != self.distTo[v] + 1:
@@ -161,4 +399,12 @@ class BreadthFirstPaths(object):
     def validateVertex(self, v: int):
         V = len(self.marked)
         if v < 0 or v >= V:
-            raise IndexError("vertex " + v + " is not between 0 and " + (V-1))
\ No newline at end of file
+            raise IndexError("vertex ", v, " is not between 0 and ", (V-1))
+
+    # raise a ValueError if vertices is empty, and an IndexError
+    # unless 0 <= v < V for each vertex v in vertices
+    def validateVertices(self, vertices: list):
+        if len(vertices) == 0:
+            raise ValueError("zero vertices")
+        for v in vertices:
+            self.validateVertex(v)
@@ -0,0 +1,134 @@
+import Graph
+
+"""
+Dependencies: Graph.py
+
+Execution:
+G = Graph.Graph(6)
+G.addEdges([(0, 2), (0, 1), (1, 2), (3, 4)])
+
+cc = CC(G)
+print(cc.count())           # 3
+print(cc.connected(0, 2))   # True
+cc.addEdge(2, 4)
+print(cc.connected(0, 3))   # True
+print(cc.size(0))           # 5
+
+"""
+
+"""
+The CC class represents a data type for determining the connected
+components in an undirected graph.
+The id operation determines in which connected component a given
+vertex lies; the connected operation determines whether two vertices
+are in the same connected component; the count operation determines
+the number of connected components; and the size operation determines
+the number of vertices in the connected component containing a given
+vertex.
+
+This implementation uses a weighted quick-union (union-find) data
+structure with path halving, so that edges added through #addEdge(int,
+int) after construction update the components incrementally instead of
+requiring another traversal of the graph.
+The constructor takes time proportional to V + E α(V), where α is the
+inverse Ackermann function; every other operation takes amortized
+time proportional to α(V), which is at most 4 for any practical V.
+It uses extra space (not including the graph) proportional to V.
+"""
+class CC(object):
+
+    """
+    Computes the connected components of the undirected graph G.
+    :param G: the undirected graph, either a Graph or a CSRGraph from
+    Graph.freeze()
+    """
+    def __init__(self, G: Graph):
+        self.G = G
+        self.parent = [v for v in range(G.V)] # parent[v] = parent of v in the union-find forest
+        self.sz = [1 for _ in range(G.V)]     # sz[v] = number of vertices in the tree rooted at v
+        self.components = G.V                # number of connected components
+        for v in range(G.V):
+            for w in G.adj[v]:
+                if v < w:
+                    self._union(v, w)
+
+    """
+    Adds the undirected edge v-w to the graph and merges the components
+    of v and w. The graph must be a Graph, since a frozen graph cannot
+    grow.
+    :param v: one vertex in the edge
+    :param w: the other vertex in the edge
+    :raises IndexError: unless both 0 <= v < V and 0 <= w < V
+    """
+    def addEdge(self, v: int, w: int):
+        self.G.addEdge(v, w)
+        self._union(v, w)
+
+    """
+    Returns the component id of the connected component containing vertex v.
+    The id is a vertex of that component; it stays the same until the
+    component is merged with another one.
+    :param v: the vertex
+    :returns: the component id of the connected component containing vertex v
+    :raises IndexError: unless 0 <= v < V
+    """
+    def id(self, v: int):
+        self.validateVertex(v)
+        return self._find(v)
+
+    """
+    Returns the number of vertices in the connected component containing vertex v.
+    :param v: the vertex
+    :returns: the number of vertices in the connected component containing vertex v
+    :raises IndexError: unless 0 <= v < V
+    """
+    def size(self, v: int):
+        self.validateVertex(v)
+        return self.sz[self._find(v)]
+
+    """
+    Returns the number of connected components in the graph G.
+    :returns: the number of connected components in the graph G
+    """
+    def count(self):
+        return self.components
+
+    """
+    Returns true if vertices v and w are in the same connected component.
+    :param v: one vertex
+    :param w: the other vertex
+    :returns: True if vertices v and w are in the same connected
+    component, and False otherwise
+    :raises IndexError: unless 0 <= v < V
+    :raises IndexError: unless 0 <= w < V
+    """
+    def connected(self, v: int, w: int):
+        self.validateVertex(v)
+        self.validateVertex(w)
+        return self._find(v) == self._find(w)
+
+    # root of the tree containing v, halving the path on the way up
+    def _find(self, v: int):
+        parent = self.parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    # merge the trees containing v and w, smaller tree below the larger one
+    def _union(self, v: int, w: int):
+        rootV = self._find(v)
+        rootW = self._find(w)
+        if rootV == rootW:
+            return
+        if self.sz[rootV] < self.sz[rootW]:
+            rootV, rootW = rootW, rootV
+        self.parent[rootW] = rootV
+        self.sz[rootV] += self.sz[rootW]
+        self.components -= 1
+
+    # raise an IndexError unless 0 <= v < V
+    def validateVertex(self, v: int):
+        V = len(self.parent)
+        if v < 0 or v >= V:
+            raise IndexError("vertex ", v, " is not between 0 and ", (V-1))
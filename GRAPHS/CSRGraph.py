@@ -0,0 +1,215 @@
+import mmap as mmapfile
+import struct
+import sys
+from array import array
+
+"""
+The CSRGraph class represents an immutable graph (or digraph) of
+vertices named 0 through V - 1, stored in compressed sparse row form.
+Instances are normally obtained by calling freeze() on a Graph or
+a Digraph once it has been built.
+
+The adjacency lists are packed into a single contiguous array of
+targets, and the adjacency list of vertex v occupies the slots
+targets[offsets[v]] through targets[offsets[v+1] - 1].
+The adj attribute exposes the adjacency lists with the same indexing
+as Graph.adj and Digraph.adj, so clients such as BreadthFirstPaths and
+DepthFirstPaths accept a CSRGraph directly.
+
+Each vertex costs one 8-byte offset and each adjacency list entry costs
+one 4-byte target, instead of a Python list per vertex and a pointer
+(plus an int object) per entry.
+The degree operations take constant time; iterating over the vertices
+adjacent to a given vertex takes time proportional to the number of
+such vertices and does not copy the adjacency list.
+
+A CSRGraph can be saved to a binary snapshot file made of a 40-byte
+header (magic, version, flags, V, E and the number of targets) followed
+by the offsets as little-endian int64 and the targets as little-endian
+int32. Loading a snapshot with mmap=True maps the file and serves the
+adjacency lists straight from the mapped pages, without a parse step.
+"""
+class CSRGraph(object):
+    MAGIC = b"ALGS4CSR"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIqqq") # magic, version, flags, V, E, number of targets
+    DIRECTED = 1                       # flags bit set for a digraph
+
+    """
+    Read-only, list-like view of the adjacency lists of a CSRGraph.
+    adj[v] returns a memoryview over the slice of the targets array
+    holding the vertices adjacent to v.
+    """
+    class AdjView(object):
+        def __init__(self, offsets, targets):
+            self._offsets = offsets
+            self._targets = memoryview(targets)
+
+        def __len__(self):
+            return len(self._offsets) - 1
+
+        def __getitem__(self, v: int):
+            return self._targets[self._offsets[v]:self._offsets[v + 1]]
+
+        def __iter__(self):
+            for v in range(len(self)):
+                yield self[v]
+
+    """
+    Initializes a graph from its compressed sparse row arrays.
+
+    :param  V: the number of vertices
+    :param  E: the number of edges
+    :param  offsets: V + 1 nondecreasing offsets into targets
+    :param  targets: the concatenated adjacency lists
+    :param  directed: True if the edges are directed
+    :raises ValueError: if V < 0 or the arrays are inconsistent with V
+    """
+    def __init__(self, V: int, E: int, offsets, targets, directed: bool):
+        if V < 0:
+            raise ValueError("number of vertices must be nonnegative")
+        if len(offsets) != V + 1 or offsets[0] != 0 or offsets[V] != len(targets):
+            raise ValueError("offsets are inconsistent with V and targets")
+        self.V = V # number of vertices in this graph
+        self.E = E # number of edges in this graph
+        self.directed = directed
+        self.offsets = offsets # offsets[v] = start of adjacency list of v in targets
+        self.targets = targets # concatenated adjacency lists
+        self.adj = CSRGraph.AdjView(offsets, targets)
+        self._reverse = None # cached reverse of a digraph
+
+    """
+    Builds a CSRGraph from list of lists adjacency lists, preserving the
+    order of every adjacency list.
+
+    :param  V: the number of vertices
+    :param  E: the number of edges
+    :param  adj: the vertex-indexed adjacency lists
+    :param  directed: True if the edges are directed
+    :returns: the frozen graph
+    """
+    @staticmethod
+    def fromAdjacency(V: int, E: int, adj, directed: bool):
+        offsets = array('q', bytes(8 * (V + 1)))
+        targets = array('i')
+        for v in range(V):
+            targets.extend(adj[v])
+            offsets[v + 1] = len(targets)
+        return CSRGraph(V, E, offsets, targets, directed)
+
+    # raise an IndexError unless 0 <= v < V
+    def validateVertex(self, v: int):
+        if v < 0 or v >= self.V:
+            raise IndexError("vertex ", v, " is not between 0 and ", (self.V-1))
+
+    """
+    Returns the degree of vertex v (the outdegree, if the graph is directed).
+
+    :param  v: the vertex
+    :returns: the degree of vertex v
+    :raises IndexError: unless 0 <= v < V
+    """
+    def degree(self, v: int):
+        self.validateVertex(v)
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def outdegree(self, v: int):
+        return self.degree(v)
+
+    """
+    Returns the reverse of the digraph, also in compressed sparse row form.
+    The reverse is computed with a counting pass over the targets, so it
+    takes time proportional to V + E and never touches a list of lists.
+    The graph is immutable, so the reverse is computed once and cached.
+    An undirected graph is its own reverse.
+
+    :returns: the reverse of the digraph
+    """
+    def reverse(self):
+        if not self.directed:
+            return self
+        if self._reverse is not None:
+            return self._reverse
+        V = self.V
+        offsets = array('q', bytes(8 * (V + 1)))
+        for w in self.targets:
+            offsets[w + 1] += 1
+        for v in range(V):
+            offsets[v + 1] += offsets[v]
+        nxt = array('q', offsets)
+        targets = array('i', bytes(4 * len(self.targets)))
+        for v in range(V):
+            for w in self.adj[v]:
+                targets[nxt[w]] = v
+                nxt[w] += 1
+        self._reverse = CSRGraph(V, self.E, offsets, targets, True)
+        self._reverse._reverse = self
+        return self._reverse
+
+    """
+    Writes this graph to a binary snapshot file.
+
+    :param  path: the path of the file
+    """
+    def save(self, path: str):
+        offsets = array('q', self.offsets)
+        targets = array('i', self.targets)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            targets.byteswap()
+        flags = self.DIRECTED if self.directed else 0
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, flags, self.V, self.E, len(targets)))
+            offsets.tofile(f)
+            targets.tofile(f)
+
+    """
+    Reads a graph from a binary snapshot file written by save().
+    With mmap=True the file is memory-mapped read-only and the offsets
+    and targets are views of the mapped file, so loading takes constant
+    time and pages are read from disk only as the graph is traversed.
+    Otherwise the arrays are read into memory.
+
+    :param  path: the path of the file
+    :param  mmap: True to memory-map the file instead of reading it
+    :returns: the graph, as a CSRGraph
+    :raises ValueError: if the file is not a snapshot or is truncated
+    """
+    @staticmethod
+    def load(path: str, mmap: bool = True):
+        header = CSRGraph.HEADER
+        with open(path, "rb") as f:
+            magic, version, flags, V, E, m = header.unpack(f.read(header.size).ljust(header.size, b"\0"))
+            if magic != CSRGraph.MAGIC or version != CSRGraph.VERSION:
+                raise ValueError(path + " is not a version " + str(CSRGraph.VERSION) + " graph snapshot")
+            end = header.size + 8 * (V + 1) + 4 * m
+            if mmap and sys.byteorder == "little":
+                buf = memoryview(mmapfile.mmap(f.fileno(), 0, access=mmapfile.ACCESS_READ))
+                if len(buf) < end:
+                    raise ValueError(path + " is truncated")
+                offsets = buf[header.size:header.size + 8 * (V + 1)].cast('q')
+                targets = buf[header.size + 8 * (V + 1):end].cast('i')
+            else:
+                offsets = array('q')
+                targets = array('i')
+                try:
+                    offsets.fromfile(f, V + 1)
+                    targets.fromfile(f, m)
+                except EOFError:
+                    raise ValueError(path + " is truncated")
+                if sys.byteorder != "little":
+                    offsets.byteswap()
+                    targets.byteswap()
+        return CSRGraph(V, E, offsets, targets, bool(flags & CSRGraph.DIRECTED))
+
+    """
+    Returns a string representation of this graph.
+
+    :returns: the number of vertices V, followed by the number of edges E,
+    followed by the V adjacency lists
+    """
+    def toString(self):
+        lines = [str(self.V) + " vertices, " + str(self.E) + " edges"]
+        for v in range(self.V):
+            lines.append(str(v) + ": " + " ".join(map(str, self.adj[v])))
+        return "\n".join(lines) + "\n"
@@ -26,9 +26,13 @@ The DepthFirstPaths class represents a data type for finding
 paths from a source vertex s to every other vertex in an 
 undirected graph.
 
-This implementation uses depth-first search.
+This implementation uses depth-first search with an explicit stack,
+so the depth of the search is not limited by the recursion limit.
 The constructor takes time proportional to V + E, where V is 
 the number of vertices and E is the number of edges.
+The static methods preorder, postorder and reversePostorder generate
+the vertices reachable from a source vertex in the corresponding order
+while the search runs.
 Each call to #hasPathTo(int) takes constant time;
 each call to #pathTo(int) takes time proportional to the length
 of the path.
@@ -38,7 +42,7 @@ class DepthFirstPaths(object):
 
     """
     Computes a path between s and every other vertex in graph G.
-    :param G: the graph
+    :param G: the graph, either a Graph or a CSRGraph from Graph.freeze()
     :param s: the source vertex
     :raises IndexError unless 0 <= s < V
     """
@@ -49,13 +53,94 @@ class DepthFirstPaths(object):
         self.validateVertex(s)
         self._dfs(G, s)
 
-    # depth first search from v
-    def _dfs(self, G: Graph, v: int):
-        self.marked[v] = True
-        for w in G.adj[v]:
-            if not self.marked[w]:
-                self.edgeTo[w] = v
-                self._dfs(G, w)
+    # depth first search from s
+    def _dfs(self, G: Graph, s: int):
+        for _ in self._search(G, s, self.marked, self.edgeTo):
+            pass
+
+    # depth first search from s with an explicit stack of
+    # (vertex, iterator over its adjacency list) pairs; visits the
+    # vertices in the same order as the recursive search and yields
+    # (v, False) when v is first reached and (v, True) when v is done
+    @staticmethod
+    def _search(G: Graph, s: int, marked: list, edgeTo: list):
+        adj = G.adj
+        marked[s] = True
+        yield s, False
+        stack = [(s, iter(adj[s]))]
+        while stack:
+            v, it = stack[-1]
+            for w in it:
+                if not marked[w]:
+                    marked[w] = True
+                    edgeTo[w] = v
+                    yield w, False
+                    stack.append((w, iter(adj[w])))
+                    break
+            else:
+                stack.pop()
+                yield v, True
+
+    """
+    Generates the vertices reachable from s in preorder, that is, in the
+    order in which the depth-first search reaches them.
+    :param G: the graph, either a Graph or a CSRGraph from Graph.freeze()
+    :param s: the source vertex
+    :returns: a generator over the vertices in preorder
+    :raises IndexError unless 0 <= s < V
+    """
+    @staticmethod
+    def preorder(G: Graph, s: int):
+        DepthFirstPaths._validateSource(G, s)
+        return DepthFirstPaths._order(G, s, False)
+
+    """
+    Generates the vertices reachable from s in postorder, that is, in the
+    order in which the depth-first search is done with them.
+    :param G: the graph, either a Graph or a CSRGraph from Graph.freeze()
+    :param s: the source vertex
+    :returns: a generator over the vertices in postorder
+    :raises IndexError unless 0 <= s < V
+    """
+    @staticmethod
+    def postorder(G: Graph, s: int):
+        DepthFirstPaths._validateSource(G, s)
+        return DepthFirstPaths._order(G, s, True)
+
+    """
+    Generates the vertices reachable from s in reverse postorder.
+    The first vertex is known only once the search is complete, so
+    this holds the postorder in a list while the search runs.
+    :param G: the graph, either a Graph or a CSRGraph from Graph.freeze()
+    :param s: the source vertex
+    :returns: a generator over the vertices in reverse postorder
+    :raises IndexError unless 0 <= s < V
+    """
+    @staticmethod
+    def reversePostorder(G: Graph, s: int):
+        DepthFirstPaths._validateSource(G, s)
+        return DepthFirstPaths._reversePostorder(G, s)
+
+    # the vertices reachable from s in postorder if post is True, and in
+    # preorder otherwise; the public methods validate s first, so that a
+    # bad source raises when they are called, not on the first next()
+    @staticmethod
+    def _order(G: Graph, s: int, post: bool):
+        for v, done in DepthFirstPaths._search(G, s, [False] * G.V, [0] * G.V):
+            if done == post:
+                yield v
+
+    @staticmethod
+    def _reversePostorder(G: Graph, s: int):
+        order = list(DepthFirstPaths._order(G, s, True))
+        while order:
+            yield order.pop()
+
+    # :raises IndexError unless 0 <= s < V
+    @staticmethod
+    def _validateSource(G: Graph, s: int):
+        if s < 0 or s >= G.V:
+            raise IndexError("vertex ", s, " is not between 0 and ", (G.V-1))
 
     """
     Is there a path between the source vertex {@code s} and vertex {@code v}?
@@ -1,3 +1,6 @@
+import CSRGraph
+import GraphIO
+
 """
 The Digraph class represents a directed graph of vertices
 named 0 through V - 1.
@@ -10,6 +13,9 @@ is a vertex-indexed array of lists.
 All operations take constant time (in the worst case) except
 iterating over the vertices adjacent from a given vertex, which takes
 time proportional to the number of such vertices.
+The in-adjacency lists (the vertices adjacent to a given vertex) are
+built the first time they are needed, in time proportional to V + E,
+and are then kept up to date by addEdge in constant time.
 """
 
 class Digraph(object):
@@ -27,6 +33,8 @@ class Digraph(object):
         self.E = 0 # number of edges in this digraph
         self.indegree = [0 for _ in range(V)] # indegree[v] = indegree of vertex v
         self.adj = [[] for _ in range(V)] # adj[v] = adjacency list for vertex v
+        self._radj = None # _radj[w] = in-adjacency list for vertex w, built lazily
+        self._reverse = None # cached reverse view
         
     
 
@@ -43,6 +51,8 @@ class Digraph(object):
         self.adj = []
         self.indegree = map(lambda x: x, G.indegree)
         self.adj = map(lambda x: x, G.adj)
+        self._radj = None
+        self._reverse = None
 
     # throw an IndexError unless 0 <= v < V
     def validateVertex(self, v: int):
@@ -63,7 +73,101 @@ class Digraph(object):
         self.adj[v].append(w)
         self.indegree[w] += 1
         self.E += 1
+        if self._radj is not None:
+            self._radj[w].append(v)
     
+    """
+    Adds a batch of directed edges to this digraph, in one pass that
+    checks each pair as it is added, without the per-edge method calls
+    of addEdge(). If a pair is rejected, the edges of the batch added
+    before it are removed again, so either every edge in the batch is
+    added or none is.
+
+    :param  edges: an iterable of (v, w) pairs
+    :raises IndexError: unless 0 <= v < V and 0 <= w < V for every pair
+    :raises ValueError: if an element of edges is not a pair
+    """
+    def addEdges(self, edges):
+        if not isinstance(edges, (list, tuple)):
+            edges = list(edges)
+        adj = self.adj
+        indegree = self.indegree
+        radj = self._radj
+        V = self.V
+        k = 0 # number of edges of the batch added so far
+        try:
+            for edge in edges:
+                try:
+                    v, w = edge
+                except (TypeError, ValueError):
+                    raise ValueError("edges must be (v, w) pairs") from None
+                if v < 0 or v >= V or w < 0 or w >= V:
+                    self.validateVertex(v)
+                    self.validateVertex(w)
+                # index with v and w before appending, so a failing edge
+                # changes nothing
+                av = adj[v]
+                indegree[w] += 1
+                av.append(w)
+                if radj is not None:
+                    radj[w].append(v)
+                k += 1
+        except BaseException:
+            self._removeEdges(edges, k)
+            raise
+        self.E += k
+
+    # remove the first k edges of a batch that addEdges() had added
+    def _removeEdges(self, edges, k: int):
+        adj = self.adj
+        indegree = self.indegree
+        radj = self._radj
+        for i in range(k - 1, -1, -1):
+            v, w = edges[i]
+            adj[v].pop()
+            indegree[w] -= 1
+            if radj is not None:
+                radj[w].pop()
+
+    # add the edges whose endpoints are ends[0], ends[1], ends[2], ...,
+    # an array('i'); the endpoints are checked with min and max before any
+    # edge is added, and converted to ints a block at a time with tolist()
+    def _addEnds(self, ends):
+        if len(ends) == 0:
+            return
+        if min(ends) < 0 or max(ends) >= self.V:
+            for v in ends:
+                self.validateVertex(v)
+        adj = self.adj
+        indegree = self.indegree
+        radj = self._radj
+        for start in range(0, len(ends), GraphIO.BLOCK_ENDS):
+            it = iter(ends[start:start + GraphIO.BLOCK_ENDS].tolist())
+            for v, w in zip(it, it):
+                adj[v].append(w)
+                indegree[w] += 1
+                if radj is not None:
+                    radj[w].append(v)
+        self.E += len(ends) // 2
+
+    """
+    Initializes a digraph from an edge list file, either in the algs4 text
+    format (V, E, then E pairs of vertices) or in the packed int32 binary
+    format read by GraphIO.readEdges().
+
+    :param  path: the path of the file
+    :param  binary: True if the file is in the packed int32 format
+    :returns: the digraph
+    :raises ValueError: if the file is malformed or V < 0
+    :raises IndexError: if an endpoint is not between 0 and V - 1
+    """
+    @staticmethod
+    def fromEdgeFile(path: str, binary: bool = False):
+        V, ends = GraphIO.readEdges(path, binary)
+        G = Digraph(V)
+        G._addEnds(ends)
+        return G
+
     """
     Returns the number of directed edges incident from vertex v.
     This is known as the outdegree of vertex v.
@@ -77,18 +181,62 @@ class Digraph(object):
         return len(self.adj[v])    
 
     """
-    Returns the reverse of the digraph.
+    Returns the vertices w such that there is an edge w→v, that is, the
+    in-adjacency list of vertex v. The list is owned by this digraph and
+    must not be modified.
+
+    :param  v: the vertex
+    :returns: the in-adjacency list of vertex v
+    :raises IndexError unless 0 <= v < V
+    """
+    def inAdj(self, v: int):
+        self.validateVertex(v)
+        return self._inAdjacency()[v]
+
+    # build the in-adjacency lists on first use; addEdge maintains them after that
+    def _inAdjacency(self):
+        if self._radj is None:
+            radj = [[] for _ in range(self.V)]
+            for v in range(self.V):
+                for w in self.adj[v]:
+                    radj[w].append(v)
+            self._radj = radj
+        return self._radj
+
+    """
+    Returns the reverse of the digraph, as a read-only view that shares the
+    in-adjacency lists of this digraph. The view is created once; edges
+    added to this digraph afterwards show up in the view immediately,
+    appended to the end of the corresponding in-adjacency lists.
     
     :return the reverse of the digraph
     """
     def reverse(self): 
-        reverse = Digraph(self.V)
-        for v in range(self.V):
-            for w in self.adj[v]:
-                reverse.addEdge(w, v)
-        return reverse
+        if self._reverse is None:
+            self._reverse = ReverseDigraph(self)
+        return self._reverse
     
 
+    """
+    Returns an immutable, array-backed copy of this digraph in compressed
+    sparse row form. The adjacency lists keep their order, so traversals
+    of the frozen digraph visit vertices in the same order as traversals
+    of this digraph.
+
+    :returns: the frozen digraph, as a CSRGraph
+    """
+    def freeze(self):
+        return CSRGraph.CSRGraph.fromAdjacency(self.V, self.E, self.adj, True)
+
+    """
+    Writes this digraph to a binary snapshot file that CSRGraph.load()
+    can map back into memory.
+
+    :param  path: the path of the file
+    """
+    def save(self, path: str):
+        self.freeze().save(path)
+
     """
     Returns a string representation of the graph.
     
@@ -96,12 +244,54 @@ class Digraph(object):
            followed by the V adjacency lists
     """
     def toString(self):
-        s = ""
-        s += str(self.V) + " vertices, " + str(self.E) + " edges " + "\n"
+        lines = [str(self.V) + " vertices, " + str(self.E) + " edges " + "\n"]
+        for v in range(self.V):
+            lines.append(str(v) + ": " + "".join([str(w) + " " for w in self.adj[v]]) + "\n")
+        return "".join(lines)
+
+
+"""
+The ReverseDigraph class is a read-only view of the reverse of a Digraph.
+Its adjacency lists are the in-adjacency lists of the underlying digraph,
+so it costs no extra space and always reflects the current edges of the
+digraph. It supports the read operations of a Digraph, so clients that
+only read V, E and adj accept it in place of a Digraph.
+"""
+class ReverseDigraph(object):
+
+    def __init__(self, G: Digraph):
+        self._G = G
+        self.adj = G._inAdjacency() # adj[v] = vertices w with an edge w→v in G
+
+    @property
+    def V(self):
+        return self._G.V
+
+    @property
+    def E(self):
+        return self._G.E
+
+    # indegree[v] = indegree of vertex v in the reverse
+    @property
+    def indegree(self):
+        return [len(a) for a in self._G.adj]
+
+    def validateVertex(self, v: int):
+        self._G.validateVertex(v)
+
+    def outdegree(self, v: int):
+        self.validateVertex(v)
+        return len(self.adj[v])
+
+    # the reverse of the reverse is the underlying digraph itself
+    def reverse(self):
+        return self._G
+
+    def freeze(self):
+        return CSRGraph.CSRGraph.fromAdjacency(self.V, self.E, self.adj, True)
+
+    def toString(self):
+        lines = [str(self.V) + " vertices, " + str(self.E) + " edges " + "\n"]
         for v in range(self.V):
-            s += str(v) + ": "
-            for w in self.adj[v]:
-                s += str(w) + " "            
-            s += "\n"        
-        return s
-        
\ No newline at end of file
+            lines.append(str(v) + ": " + "".join([str(w) + " " for w in self.adj[v]]) + "\n")
+        return "".join(lines)
@@ -1,4 +1,7 @@
 
+import CSRGraph
+import GraphIO
+
 """
 The Graph class represents an undirected graph of vertices
 named 0 through V – 1.
@@ -69,6 +72,86 @@ class Graph(object):
         self.adj[v].append(w)
         self.adj[w].append(v)
     
+    """
+    Adds a batch of undirected edges to this graph, in one pass that
+    checks each pair as it is added, without the per-edge method calls
+    of addEdge(). If a pair is rejected, the edges of the batch added
+    before it are removed again, so either every edge in the batch is
+    added or none is.
+
+    :param  edges: an iterable of (v, w) pairs
+    :raises IndexError: unless 0 <= v < V and 0 <= w < V for every pair
+    :raises ValueError: if an element of edges is not a pair
+    """
+    def addEdges(self, edges):
+        if not isinstance(edges, (list, tuple)):
+            edges = list(edges)
+        adj = self.adj
+        V = self.V
+        k = 0 # number of edges of the batch added so far
+        try:
+            for edge in edges:
+                try:
+                    v, w = edge
+                except (TypeError, ValueError):
+                    raise ValueError("edges must be (v, w) pairs") from None
+                if v < 0 or v >= V or w < 0 or w >= V:
+                    self.validateVertex(v)
+                    self.validateVertex(w)
+                # look up both lists first, so a failing edge changes nothing
+                av = adj[v]
+                aw = adj[w]
+                av.append(w)
+                aw.append(v)
+                k += 1
+        except BaseException:
+            self._removeEdges(edges, k)
+            raise
+        self.E += k
+
+    # remove the first k edges of a batch that addEdges() had added
+    def _removeEdges(self, edges, k: int):
+        adj = self.adj
+        for i in range(k - 1, -1, -1):
+            v, w = edges[i]
+            adj[w].pop()
+            adj[v].pop()
+
+    # add the edges whose endpoints are ends[0], ends[1], ends[2], ...,
+    # an array('i'); the endpoints are checked with min and max before any
+    # edge is added, and converted to ints a block at a time with tolist()
+    def _addEnds(self, ends):
+        if len(ends) == 0:
+            return
+        if min(ends) < 0 or max(ends) >= self.V:
+            for v in ends:
+                self.validateVertex(v)
+        adj = self.adj
+        for start in range(0, len(ends), GraphIO.BLOCK_ENDS):
+            it = iter(ends[start:start + GraphIO.BLOCK_ENDS].tolist())
+            for v, w in zip(it, it):
+                adj[v].append(w)
+                adj[w].append(v)
+        self.E += len(ends) // 2
+
+    """
+    Initializes a graph from an edge list file, either in the algs4 text
+    format (V, E, then E pairs of vertices) or in the packed int32 binary
+    format read by GraphIO.readEdges().
+
+    :param  path: the path of the file
+    :param  binary: True if the file is in the packed int32 format
+    :returns: the graph
+    :raises ValueError: if the file is malformed or V < 0
+    :raises IndexError: if an endpoint is not between 0 and V - 1
+    """
+    @staticmethod
+    def fromEdgeFile(path: str, binary: bool = False):
+        V, ends = GraphIO.readEdges(path, binary)
+        G = Graph(V)
+        G._addEnds(ends)
+        return G
+
     """
     Returns the degree of vertex v.
     
@@ -81,6 +164,26 @@ class Graph(object):
         return len(self.adj[v])
 
 
+    """
+    Returns an immutable, array-backed copy of this graph in compressed
+    sparse row form. The adjacency lists keep their order, so traversals
+    of the frozen graph visit vertices in the same order as traversals
+    of this graph.
+
+    :returns: the frozen graph, as a CSRGraph
+    """
+    def freeze(self):
+        return CSRGraph.CSRGraph.fromAdjacency(self.V, self.E, self.adj, False)
+
+    """
+    Writes this graph to a binary snapshot file that CSRGraph.load()
+    can map back into memory.
+
+    :param  path: the path of the file
+    """
+    def save(self, path: str):
+        self.freeze().save(path)
+
     """
     Returns a string representation of this graph.
     
@@ -88,11 +191,7 @@ class Graph(object):
     followed by the V adjacency lists
     """
     def toString(self):
-        s = str(self.V) + " vertices, " + str(self.E) + " edges\n"
+        lines = [str(self.V) + " vertices, " + str(self.E) + " edges\n"]
         for v in range(self.V):
-            s += str(v) + ": "
-            for w in self.adj[v]:
-                s += str(w) + ", "
-            
-            s += "\n"
-        return s
+            lines.append(str(v) + ": " + "".join([str(w) + ", " for w in self.adj[v]]) + "\n")
+        return "".join(lines)
@@ -0,0 +1,108 @@
+import sys
+from array import array
+
+"""
+Readers for the edge list formats used to build a Graph or a Digraph
+in bulk.
+
+The text format is the one used by the algs4 data files: the number of
+vertices V, followed by the number of edges E, followed by E pairs of
+vertices, all separated by whitespace.
+The binary format holds the same numbers as packed little-endian 32-bit
+integers: V, E and then the 2E endpoints, two per edge.
+
+Both readers stream the file in fixed-size blocks and return the
+endpoints as one flat array('i') [v0, w0, v1, w1, ...], so a file of
+E edges costs 8E bytes of memory instead of 2E Python ints.
+"""
+
+BLOCK_SIZE = 1 << 20 # bytes read per block
+BLOCK_ENDS = 1 << 16 # endpoints converted to ints per block when adding them
+
+
+"""
+Reads an edge list file.
+
+:param path: the path of the file
+:param binary: True if the file is in the packed int32 format
+:returns: the tuple (V, ends) where ends holds the endpoints
+of the edges, two per edge
+:raises ValueError: if the file is truncated or malformed
+"""
+def readEdges(path: str, binary: bool = False):
+    if binary:
+        return _readBinary(path)
+    return _readText(path)
+
+
+def _readText(path: str):
+    ints = array('i')
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            block = tail + block
+            # the last token of the block may continue in the next block
+            cut = len(block)
+            while cut > 0 and not block[cut - 1:cut].isspace():
+                cut -= 1
+            tail = block[cut:]
+            ints.extend(map(int, block[:cut].split()))
+        if tail:
+            ints.extend(map(int, tail.split()))
+    if len(ints) < 2:
+        raise ValueError("edge file is missing the V and E header")
+    V, E = ints[0], ints[1]
+    if E < 0:
+        raise ValueError("number of edges must be nonnegative")
+    if len(ints) != 2 + 2 * E:
+        raise ValueError("edge file holds " + str(len(ints) - 2) + " endpoints, expected " + str(2 * E))
+    return V, ints[2:]
+
+
+def _readBinary(path: str):
+    with open(path, "rb") as f:
+        header = array('i')
+        try:
+            header.fromfile(f, 2)
+        except EOFError:
+            raise ValueError("edge file is missing the V and E header")
+        if sys.byteorder != "little":
+            header.byteswap()
+        V, E = header[0], header[1]
+        if E < 0:
+            raise ValueError("number of edges must be nonnegative")
+        ends = array('i')
+        try:
+            ends.fromfile(f, 2 * E)
+        except EOFError:
+            raise ValueError("edge file holds fewer than " + str(E) + " edges")
+    if sys.byteorder != "little":
+        ends.byteswap()
+    return V, ends
+
+
+"""
+Writes an edge list file that readEdges() can read back.
+
+:param path: the path of the file
+:param V: the number of vertices
+:param ends: the endpoints of the edges, two per edge
+:param binary: True to write the packed int32 format
+"""
+def writeEdges(path: str, V: int, ends, binary: bool = False):
+    ends = array('i', ends)
+    if binary:
+        data = array('i', [V, len(ends) // 2])
+        data.extend(ends)
+        if sys.byteorder != "little":
+            data.byteswap()
+        with open(path, "wb") as f:
+            data.tofile(f)
+        return
+    with open(path, "w") as f:
+        f.write(str(V) + "\n" + str(len(ends) // 2) + "\n")
+        for i in range(0, len(ends), 2):
+            f.write(str(ends[i]) + " " + str(ends[i + 1]) + "\n")
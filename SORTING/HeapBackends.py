@@ -0,0 +1,379 @@
+"""
+Heap backends for PQ, selected with its backend argument.
+
+ binary: the binary heap kept in a list by the heapq module. PQ uses it
+ directly, so it has no class here. Its sifts run in C, so in CPython it
+ is the fastest backend for insert and delete, and the default.
+ dary: a d-ary heap kept in a list (DaryHeap). A larger d makes the heap
+ shallower, so insert (which sifts up, one compare per level) gets
+ cheaper while delete (which compares d children per level) gets more
+ expensive. Its sifts run in Python, so in CPython it is never faster
+ than the binary heap, whose sifts run in C: the sorting/pq-backend
+ benchmarks show binary ahead for every d on every workload, including
+ insert-heavy ones and keys with a Python __lt__. (A reverse=True binary
+ heap sifts in Python too before Python 3.14, and then runs about as
+ fast as the d-ary heaps.) It is meant for interpreters whose heapq is
+ written in Python, such as PyPy, where d trades the cost of insert
+ against the cost of delete as described above.
+ pairing: a pairing heap of linked nodes (PairingHeap). insert and meld
+ take constant time and decrease-key takes amortized sublogarithmic
+ time, so it suits workloads that meld many queues, or that change the
+ priority of queued keys when memory for stale duplicates is a concern.
+
+Every backend stores entries that are compared with <, in increasing
+order, or in decreasing order if reverse is True, and has the same
+methods: push(entry), pop(), top(), meld(other), entries(), isHeap()
+and len(). push and pop have the signature of heapq.heappush and
+heapq.heappop when called on the class, so PQ calls them the same way
+for every backend.
+The benchmarks under sorting/pq-backend compare the backends on
+insert/delete, insert-heavy, meld and decrease-key workloads.
+"""
+
+NAMES = ("binary", "dary", "pairing")
+
+
+"""
+Returns a new backend holding the given entries.
+:param name: the name of the backend, other than binary
+:param entries: the list of entries
+:param reverse: True to order the entries from largest to smallest
+:param d: the number of children of every node of a d-ary heap
+:returns: the backend
+:raises ValueError: if the name is unknown
+"""
+def newHeap(name: str, entries: list, reverse: bool, d: int):
+    if name == "dary":
+        return DaryHeap(entries, reverse, d)
+    if name == "pairing":
+        return PairingHeap(entries, reverse)
+    raise ValueError("unknown heap backend " + str(name) + ", expected one of " + ", ".join(NAMES))
+
+
+"""
+The DaryHeap class is a heap in which every node has up to d children,
+stored in a 0-based list: the children of a[k] are a[d*k + 1] through
+a[d*k + d].
+The push operation takes time proportional to log n / log d, and the
+pop operation takes time proportional to d log n / log d.
+Construction takes linear time.
+"""
+class DaryHeap(object):
+
+    """
+    Initializes a d-ary heap from the list of entries.
+    :param entries: the list of entries
+    :param reverse: True to order the entries from largest to smallest
+    :param d: the number of children of every node
+    :raises ValueError: if d < 2
+    """
+    def __init__(self, entries: list, reverse: bool = False, d: int = 4):
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.d = d
+        self.reverse = reverse
+        self.a = list(entries)
+        self._heapify()
+
+    # sink every internal node, from the last one up to the root
+    def _heapify(self):
+        for k in range((len(self.a) - 2) // self.d, -1, -1):
+            self._sink(k)
+
+    def __len__(self):
+        return len(self.a)
+
+    """
+    Returns the top entry, without removing it.
+    :returns: the top entry
+    """
+    def top(self):
+        return self.a[0]
+
+    """
+    Adds an entry to the heap.
+    :param entry: the entry
+    """
+    def push(self, entry):
+        self.a.append(entry)
+        self._swim(len(self.a) - 1)
+
+    """
+    Removes and returns the top entry.
+    :returns: the top entry
+    :raises IndexError: if the heap is empty
+    """
+    def pop(self):
+        a = self.a
+        last = a.pop()
+        if not a:
+            return last
+        top = a[0]
+        a[0] = last
+        self._sink(0)
+        return top
+
+    """
+    Moves all the entries of another d-ary heap to this one, which takes
+    time proportional to the total number of entries.
+    :param other: the other heap, which is left empty
+    """
+    def meld(self, other):
+        self.a.extend(other.a)
+        other.a = []
+        self._heapify()
+
+    """
+    Returns the entries, in no particular order.
+    :returns: the list of entries
+    """
+    def entries(self):
+        return list(self.a)
+
+    # is a[0..n-1] a heap? every entry is compared with its parent
+    def isHeap(self):
+        a = self.a
+        for k in range(1, len(a)):
+            p = (k - 1) // self.d
+            if (a[p] < a[k]) if self.reverse else (a[k] < a[p]):
+                return False
+        return True
+
+    # move a[k] up while it comes before its parent, shifting the
+    # parents down into the hole instead of swapping
+    def _swim(self, k: int):
+        a = self.a
+        d = self.d
+        reverse = self.reverse
+        entry = a[k]
+        while k > 0:
+            p = (k - 1) // d
+            if not ((a[p] < entry) if reverse else (entry < a[p])):
+                break
+            a[k] = a[p]
+            k = p
+        a[k] = entry
+
+    # move a[k] down while one of its children comes before it
+    def _sink(self, k: int):
+        a = self.a
+        d = self.d
+        n = len(a)
+        reverse = self.reverse
+        entry = a[k]
+        while True:
+            first = d * k + 1
+            if first >= n:
+                break
+            best = first
+            for j in range(first + 1, min(first + d, n)):
+                if (a[best] < a[j]) if reverse else (a[j] < a[best]):
+                    best = j
+            if not ((entry < a[best]) if reverse else (a[best] < entry)):
+                break
+            a[k] = a[best]
+            k = best
+        a[k] = entry
+
+
+"""
+The PairingHeap class is a heap-ordered multiway tree of nodes, in which
+the children of a node form a doubly linked list.
+push links a new node with the root and meld links the two roots, so
+both take constant time. pop removes the root and links its children in
+pairs from left to right, then from right to left, which takes amortized
+logarithmic time. decreaseKey cuts the node from its parent and links it
+with the root; its amortized time is sublogarithmic.
+The nodes returned by push are handles for decreaseKey.
+Every node refers to a one-element owner cell of its heap. meld forwards
+the cell of the emptied heap to the cell of the heap that took its
+nodes, instead of visiting them, so a node's heap is found by following
+the cells; the forwarding chains are compressed as they are followed.
+"""
+class PairingHeap(object):
+
+    # heap node; prev is the previous sibling, or the parent of the first child
+    class Node:
+        __slots__ = ("entry", "child", "next", "prev", "owner")
+
+        def __init__(self, entry, owner: list):
+            self.entry = entry
+            self.child = None
+            self.next = None
+            self.prev = None
+            self.owner = owner # owner cell of the heap, or None once popped
+
+    """
+    Initializes a pairing heap from the list of entries, in linear time.
+    :param entries: the list of entries
+    :param reverse: True to order the entries from largest to smallest
+    """
+    def __init__(self, entries: list, reverse: bool = False):
+        self.reverse = reverse
+        self.root = None
+        self.n = 0
+        self._owner = [None] # owner cell: [None], or [cell] once melded into another heap
+        for entry in entries:
+            self.push(entry)
+
+    def __len__(self):
+        return self.n
+
+    # does entry x come before entry y?
+    def _before(self, x, y):
+        return y < x if self.reverse else x < y
+
+    # link two roots, making the one that comes later the first child
+    # of the other; returns the new root
+    def _link(self, x: Node, y: Node):
+        if self._before(y.entry, x.entry):
+            x, y = y, x
+        y.prev = x
+        y.next = x.child
+        if x.child is not None:
+            x.child.prev = y
+        x.child = y
+        return x
+
+    """
+    Returns the top entry, without removing it.
+    :returns: the top entry
+    """
+    def top(self):
+        return self.root.entry
+
+    """
+    Adds an entry to the heap.
+    :param entry: the entry
+    :returns: the node of the entry, a handle for decreaseKey
+    """
+    def push(self, entry):
+        x = self.Node(entry, self._owner)
+        self.root = x if self.root is None else self._link(self.root, x)
+        self.n += 1
+        return x
+
+    """
+    Removes and returns the top entry.
+    :returns: the top entry
+    :raises IndexError: if the heap is empty
+    """
+    def pop(self):
+        root = self.root
+        if root is None:
+            raise IndexError("pop from empty heap")
+        # first pass: link the children in pairs, from left to right
+        pairs = []
+        x = root.child
+        while x is not None:
+            y = x.next
+            x.next = x.prev = None
+            if y is None:
+                pairs.append(x)
+                break
+            nxt = y.next
+            y.next = y.prev = None
+            pairs.append(self._link(x, y))
+            x = nxt
+        # second pass: link the pairs from right to left
+        newRoot = pairs.pop() if pairs else None
+        while pairs:
+            newRoot = self._link(pairs.pop(), newRoot)
+        self.root = newRoot
+        self.n -= 1
+        root.child = None
+        root.owner = None
+        return root.entry
+
+    """
+    Is x a node of this heap? Follows, and compresses, the forwarding
+    chain of its owner cell.
+    :param x: a handle returned by push
+    :returns: true if x is a node of this heap, and false if it belongs
+    to another heap, was popped, or is not a node
+    """
+    def contains(self, x):
+        if not isinstance(x, PairingHeap.Node):
+            return False
+        cell = x.owner
+        if cell is None:
+            return False
+        while cell[0] is not None:
+            if cell[0][0] is not None:
+                cell[0] = cell[0][0]
+            cell = cell[0]
+        x.owner = cell
+        return cell is self._owner
+
+    """
+    Replaces the entry of a node with one that comes no later, and
+    restores the heap order.
+    :param x: the node, as returned by push
+    :param entry: the new entry
+    :param key: a function of one argument that extracts the part of an
+    entry compared to check that the new entry comes no later, or None
+    to compare the entries themselves
+    :raises ValueError: if the node is not in the heap, or if the new
+    entry comes after the current one
+    """
+    def decreaseKey(self, x: Node, entry, key=None):
+        if not self.contains(x):
+            raise ValueError("node is not in the heap")
+        if self._before(x.entry, entry) if key is None else self._before(key(x.entry), key(entry)):
+            raise ValueError("new entry comes after the current entry")
+        x.entry = entry
+        if x is self.root:
+            return
+        # cut the subtree of x from its siblings and parent
+        if x.prev.child is x:
+            x.prev.child = x.next
+        else:
+            x.prev.next = x.next
+        if x.next is not None:
+            x.next.prev = x.prev
+        x.next = x.prev = None
+        self.root = self._link(self.root, x)
+
+    """
+    Moves all the entries of another pairing heap to this one, in
+    constant time.
+    :param other: the other heap, which is left empty
+    """
+    def meld(self, other):
+        if other.root is not None:
+            self.root = other.root if self.root is None else self._link(self.root, other.root)
+        self.n += other.n
+        other.root = None
+        other.n = 0
+        # the nodes of other now belong to this heap
+        other._owner[0] = self._owner
+        other._owner = [None]
+
+    """
+    Returns the entries, in no particular order.
+    :returns: the list of entries
+    """
+    def entries(self):
+        result = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            x = stack.pop()
+            result.append(x.entry)
+            if x.next is not None:
+                stack.append(x.next)
+            if x.child is not None:
+                stack.append(x.child)
+        return result
+
+    # does every node come no earlier than its parent?
+    def isHeap(self):
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            x = stack.pop()
+            child = x.child
+            while child is not None:
+                if self._before(child.entry, x.entry):
+                    return False
+                stack.append(child)
+                child = child.next
+        return True
@@ -0,0 +1,267 @@
+from array import array
+
+"""
+The IndexMaxPQ class represents an indexed priority queue of keys.
+It supports the usual insert and delete-the-maximum
+operations, along with delete and change-the-key methods.
+In order to let the client refer to keys on the priority queue,
+an integer between 0 and maxN - 1 is associated with each key;
+the client uses this integer to specify which key to delete or change.
+It also supports methods for peeking at the maximum key,
+testing if the priority queue is empty, and getting the key
+associated with an index.
+This class does not permit None keys.
+
+This implementation uses a binary heap of indices along with an array
+to associate keys with indices, and an inverse array from indices to
+heap positions, so that the heap position of any index is found in
+constant time.
+The heap and its inverse are stored in compact int32 arrays.
+The insert, delete-the-maximum, delete, change-key, decrease-key,
+and increase-key operations take logarithmic time.
+The is-empty, size, max-index, max-key, contains, and key-of
+operations take constant time.
+Construction takes time proportional to the specified capacity.
+"""
+
+class IndexMaxPQ(object):
+
+    """
+    Initializes an empty indexed priority queue with indices between
+    0 and maxN - 1.
+
+    :param  maxN: the keys on this priority queue are index from 0 to maxN - 1
+    :raises ValueError: if maxN < 0
+    """
+    def __init__(self, maxN: int):
+        if maxN < 0:
+            raise ValueError("maxN must be nonnegative")
+        self.maxN = maxN                         # maximum number of elements on PQ
+        self.n = 0                               # number of elements on PQ
+        self.pq = array('i', [0]) * (maxN + 1)   # binary heap using 1-based indexing
+        self.qp = array('i', [-1]) * maxN        # inverse of pq: qp[pq[i]] = pq[qp[i]] = i
+        self.keys = [None] * maxN                # keys[i] = priority of i
+
+    """
+    Returns true if this priority queue is empty.
+
+    :returns: true if this priority queue is empty
+           false otherwise
+    """
+    def isEmpty(self):
+        return self.n == 0
+
+    """
+    Is i an index on this priority queue?
+
+    :param  i: an index
+    :returns: true if i is an index on this priority queue
+           false otherwise
+    :raises IndexError: unless 0 <= i < maxN
+    """
+    def contains(self, i: int):
+        self._validateIndex(i)
+        return self.qp[i] != -1
+
+    """
+    Returns the number of keys on this priority queue.
+
+    :returns: the number of keys on this priority queue
+    """
+    def size(self):
+        return self.n
+
+    """
+    Associates key with index i.
+
+    :param  i: an index
+    :param  key: the key to associate with index i
+    :raises IndexError: unless 0 <= i < maxN
+    :raises ValueError: if there already is an item associated
+    with index i
+    :raises TypeError: if the key is None
+    """
+    def insert(self, i: int, key):
+        self._validateIndex(i)
+        if self.contains(i):
+            raise ValueError("index is already in the priority queue")
+        if key is None:
+            raise TypeError("key is None")
+        self.n += 1
+        self.qp[i] = self.n
+        self.pq[self.n] = i
+        self.keys[i] = key
+        self._swim(self.n)
+
+    """
+    Returns an index associated with a maximum key.
+
+    :returns: an index associated with a maximum key
+    :raises AssertionError: if this priority queue is empty
+    """
+    def maxIndex(self):
+        if self.isEmpty():
+            raise AssertionError("Priority queue underflow")
+        return self.pq[1]
+
+    """
+    Returns a maximum key.
+
+    :returns: a maximum key
+    :raises AssertionError: if this priority queue is empty
+    """
+    def maxKey(self):
+        if self.isEmpty():
+            raise AssertionError("Priority queue underflow")
+        return self.keys[self.pq[1]]
+
+    """
+    Removes a maximum key and returns its associated index.
+
+    :returns: an index associated with a maximum key
+    :raises KeyError: if this priority queue is empty
+    """
+    def delMax(self):
+        if self.isEmpty():
+            raise KeyError("Priority queue underflow")
+        max = self.pq[1]
+        self._exch(1, self.n)
+        self.n -= 1
+        self._sink(1)
+        self.qp[max] = -1       # delete
+        self.keys[max] = None   # to help with garbage collection
+        return max
+
+    """
+    Returns the key associated with index i.
+
+    :param  i: the index of the key to return
+    :returns: the key associated with index i
+    :raises IndexError: unless 0 <= i < maxN
+    :raises KeyError: if no key is associated with index i
+    """
+    def keyOf(self, i: int):
+        self._validateIndex(i)
+        if not self.contains(i):
+            raise KeyError("index is not in the priority queue")
+        return self.keys[i]
+
+    """
+    Change the key associated with index i to the specified value.
+
+    :param  i: the index of the key to change
+    :param  key: change the key associated with index i to this key
+    :raises IndexError: unless 0 <= i < maxN
+    :raises KeyError: if no key is associated with index i
+    :raises TypeError: if the key is None
+    """
+    def changeKey(self, i: int, key):
+        self._validateIndex(i)
+        if not self.contains(i):
+            raise KeyError("index is not in the priority queue")
+        if key is None:
+            raise TypeError("key is None")
+        self.keys[i] = key
+        self._swim(self.qp[i])
+        self._sink(self.qp[i])
+
+    """
+    Decrease the key associated with index i to the specified value.
+
+    :param  i: the index of the key to decrease
+    :param  key: decrease the key associated with index i to this key
+    :raises IndexError: unless 0 <= i < maxN
+    :raises KeyError: if no key is associated with index i
+    :raises ValueError: if key >= keyOf(i)
+    :raises TypeError: if the key is None
+    """
+    def decreaseKey(self, i: int, key):
+        self._validateIndex(i)
+        if not self.contains(i):
+            raise KeyError("index is not in the priority queue")
+        if key is None:
+            raise TypeError("key is None")
+        if not key < self.keys[i]:
+            raise ValueError("calling decreaseKey() with a key that is not strictly less than the key in the priority queue")
+        self.keys[i] = key
+        self._sink(self.qp[i])
+
+    """
+    Increase the key associated with index i to the specified value.
+
+    :param  i: the index of the key to increase
+    :param  key: increase the key associated with index i to this key
+    :raises IndexError: unless 0 <= i < maxN
+    :raises KeyError: if no key is associated with index i
+    :raises ValueError: if key <= keyOf(i)
+    :raises TypeError: if the key is None
+    """
+    def increaseKey(self, i: int, key):
+        self._validateIndex(i)
+        if not self.contains(i):
+            raise KeyError("index is not in the priority queue")
+        if key is None:
+            raise TypeError("key is None")
+        if not self.keys[i] < key:
+            raise ValueError("calling increaseKey() with a key that is not strictly greater than the key in the priority queue")
+        self.keys[i] = key
+        self._swim(self.qp[i])
+
+    """
+    Remove the key associated with index i.
+
+    :param  i: the index of the key to remove
+    :raises IndexError: unless 0 <= i < maxN
+    :raises KeyError: if no key is associated with index i
+    """
+    def delete(self, i: int):
+        self._validateIndex(i)
+        if not self.contains(i):
+            raise KeyError("index is not in the priority queue")
+        index = self.qp[i]
+        self._exch(index, self.n)
+        self.n -= 1
+        if index <= self.n:
+            self._swim(index)
+            self._sink(index)
+        self.keys[i] = None
+        self.qp[i] = -1
+
+    # raise an IndexError unless 0 <= i < maxN
+    def _validateIndex(self, i: int):
+        if i < 0 or i >= self.maxN:
+            raise IndexError("index ", i, " is not between 0 and ", (self.maxN-1))
+
+    ########################################################################
+    # Helper functions to restore the heap invariant.
+    ########################################################################
+
+    def _swim(self, k: int):
+        while k > 1 and self._less(k // 2, k):
+            self._exch(k, k // 2)
+            k = k // 2
+
+    def _sink(self, k: int):
+        while 2 * k <= self.n:
+            j = 2 * k
+            if j < self.n and self._less(j, j + 1):
+                j += 1
+            if not self._less(k, j):
+                break
+            self._exch(k, j)
+            k = j
+
+    ########################################################################
+    # Helper functions for compares and swaps.
+    ########################################################################
+
+    def _less(self, i: int, j: int):
+        return self.keys[self.pq[i]] < self.keys[self.pq[j]]
+
+    def _exch(self, i: int, j: int):
+        pq = self.pq
+        swap = pq[i]
+        pq[i] = pq[j]
+        pq[j] = swap
+        self.qp[pq[i]] = i
+        self.qp[pq[j]] = j
@@ -0,0 +1,409 @@
+import heapq
+from itertools import count, islice
+from operator import itemgetter
+import HeapBackends
+
+"""
+Dependencies: HeapBackends.py
+
+Execution:
+pq = PQ([5, 1, 4], reverse=True)
+pq.insert(3)
+print(pq.pop(), pq.pop())              # 5 4
+
+# keys that cannot be compared themselves, melded across queues
+byP = lambda job: job["p"]
+a = PQ([{"p": 1, "id": "a1"}, {"p": 1, "id": "a2"}], key=byP, backend="pairing")
+b = PQ([{"p": 1, "id": "b1"}, {"p": 0, "id": "b0"}], key=byP, backend="pairing")
+a.meld(b)
+print([a.pop()["id"] for _ in range(4)]) # ['b0', 'a1', 'a2', 'b1']
+
+# decreaseKey to an equal key(x) keeps the key in place
+c = PQ([], key=byP, backend="pairing")
+h = c.insert({"p": 2, "id": "c1"})
+c.insert({"p": 2, "id": "c2"})
+c.decreaseKey(h, {"p": 2, "id": "c1'"})
+print([c.pop()["id"] for _ in range(2)]) # ["c1'", 'c2']
+
+"""
+
+"""
+The PQ class represents a priority queue of keys, ordered either from
+smallest to largest or, with reverse=True, from largest to smallest.
+This class does not permit None elements.
+It supports the usual insert and delete-the-top operations, along
+with methods for peeking at the top key, testing if the priority queue
+is empty, and getting all the keys in priority order.
+Like sorted(), it accepts a key function: the keys are then ordered by
+key(x) instead of x, and keys with equal key(x) come out in the order
+they were inserted.
+
+This implementation uses a binary heap stored in a 0-based list and
+maintained by the heapq module, so the sift-up and sift-down loops and
+the compares run in C instead of calling __lt__ from Python. Without a
+key function the keys are stored as they are; with one, every key is
+stored as a (key(x), tiebreak, x) tuple, so key is called once per key
+and x itself is never compared.
+The heapq module has public max-heap functions only from Python 3.14
+on; on older versions a reverse=True priority queue sifts with the
+Python max-heap functions of this module instead, so its operations
+are slower than those of a reverse=False one.
+The insert and delete-the-top operations take logarithmic time.
+The peek, size, and is-empty operations take constant time.
+Construction takes time proportional to the specified number of
+items used to initialize the data structure.
+The heap invariant is only checked after every operation when the
+priority queue is created with debug=True, since the check takes
+linear time.
+
+The backend argument selects another heap from HeapBackends instead of
+the heapq binary heap: a d-ary heap ("dary", with d children per node)
+or a pairing heap ("pairing"), which also supports decreaseKey.
+Priority queues can be melded whatever their backend, in constant time
+with pairing heaps and in linear time otherwise.
+
+iterKeys generates the keys in priority order without modifying the
+heap: it keeps an auxiliary heap of the positions (or nodes) whose
+parents were already generated, so the first k keys take time
+proportional to k log k (plus the number of children of the k keys
+with the pairing backend), and topKeys returns the first k keys.
+"""
+
+########################################################################
+# Max-heap functions with the signatures of heapq.heapify, heappush and
+# heappop, for Python versions whose heapq has no public max-heap
+# functions (before 3.14).
+########################################################################
+
+# move heap[k] up while it is larger than its parent
+def _swimMax(heap: list, k: int):
+    x = heap[k]
+    while k > 0:
+        p = (k - 1) // 2
+        if not heap[p] < x:
+            break
+        heap[k] = heap[p]
+        k = p
+    heap[k] = x
+
+# move heap[k] down while one of its children is larger
+def _sinkMax(heap: list, k: int):
+    n = len(heap)
+    x = heap[k]
+    while True:
+        j = 2 * k + 1
+        if j >= n:
+            break
+        if j + 1 < n and heap[j] < heap[j + 1]:
+            j += 1
+        if not x < heap[j]:
+            break
+        heap[k] = heap[j]
+        k = j
+    heap[k] = x
+
+def _heapifyMaxPy(heap: list):
+    for k in range(len(heap) // 2 - 1, -1, -1):
+        _sinkMax(heap, k)
+
+def _heappushMaxPy(heap: list, x):
+    heap.append(x)
+    _swimMax(heap, len(heap) - 1)
+
+def _heappopMaxPy(heap: list):
+    last = heap.pop()
+    if not heap:
+        return last
+    top = heap[0]
+    heap[0] = last
+    _sinkMax(heap, 0)
+    return top
+
+# the public heapq functions if available, otherwise the ones above
+_heapifyMax = getattr(heapq, "heapify_max", None) or _heapifyMaxPy
+_heappushMax = getattr(heapq, "heappush_max", None) or _heappushMaxPy
+_heappopMax = getattr(heapq, "heappop_max", None) or _heappopMaxPy
+
+# tiebreaks of the decorated entries of every priority queue
+_tiebreak = count(1)
+
+# the (key(x), tiebreak) part of a decorated entry, which orders it
+# without comparing x
+_rank = itemgetter(0, 1)
+
+
+class PQ(object):
+
+    """
+    Initializes a priority queue from the list of keys.
+    Takes time proportional to the number of keys, using heapify.
+
+    :param  keys: the list of keys
+    :param  key: a function of one argument that extracts the comparison
+    key from each key, or None to compare the keys themselves
+    :param  reverse: True to remove the largest key first
+    :param  debug: True to check the heap invariant after every operation
+    :param  backend: the heap backend: "binary", "dary" or "pairing"
+    :param  d: the number of children of every node of a d-ary heap
+    :raises TypeError: if a key is None
+    :raises ValueError: if the backend is unknown, or d < 2
+    :raises AssertionError: if debug is True and the priority queue
+    after this operation is not a heap
+    """
+    def __init__(self, keys: list, key=None, reverse: bool = False, debug: bool = False,
+                 backend: str = "binary", d: int = 4):
+        self.key = key
+        self.reverse = reverse
+        self.debug = debug
+        self.backend = backend
+        if key is None:
+            self.heap = list(keys)
+            for x in self.heap:
+                if x is None:
+                    raise TypeError("key is None")
+        else:
+            self.heap = []
+            for x in keys:
+                if x is None:
+                    raise TypeError("key is None")
+                self.heap.append(self._decorate(x))
+        if backend != "binary":
+            # the backend's push and pop take the heap as first argument, like heapq's
+            self.heap = HeapBackends.newHeap(backend, self.heap, reverse, d)
+            self._push = type(self.heap).push
+            self._pop = type(self.heap).pop
+        elif reverse:
+            self._push = _heappushMax
+            self._pop = _heappopMax
+            _heapifyMax(self.heap)
+        else:
+            self._push = heapq.heappush
+            self._pop = heapq.heappop
+            heapq.heapify(self.heap)
+        if self.debug:
+            assert self._isHeap(), "Priority Queue is not a Heap"
+
+    # the (key(x), tiebreak, x) entry of x; the tiebreak makes equal keys
+    # come out in insertion order in both directions. It is drawn from a
+    # counter shared by all priority queues, so entries stay distinct (and x
+    # is never compared) after a meld
+    def _decorate(self, x):
+        seq = next(_tiebreak)
+        return (self.key(x), -seq if self.reverse else seq, x)
+
+    """
+    Returns true if this priority queue is empty.
+
+    :returns: true if this priority queue is empty
+           false otherwise
+    """
+    def isEmpty(self):
+        return not self.heap
+
+    """
+    Returns the number of keys on this priority queue.
+
+    :returns: the number of keys on this priority queue
+    """
+    def size(self):
+        return len(self.heap)
+
+    """
+    Returns the top key on this priority queue: a smallest key, or a
+    largest key if reverse is True.
+
+    :returns: the top key on this priority queue
+    :raises AssertionError: if this priority queue is empty
+    """
+    def peek(self):
+        if not self.heap:
+            raise AssertionError("Priority queue underflow")
+        top = self.heap[0] if self.backend == "binary" else self.heap.top()
+        if self.key is None:
+            return top
+        return top[2]
+
+    """
+    Adds a new key to this priority queue.
+
+    :param  x: the key to add to this priority queue
+    :returns: a handle for decreaseKey with the pairing backend,
+    and None otherwise
+    :raises TypeError: if the key is None
+    :raises AssertionError: if debug is True and the priority queue
+    after this operation is not a heap
+    """
+    def insert(self, x):
+        if x is None:
+            raise TypeError("key is None")
+        if self.key is None:
+            handle = self._push(self.heap, x)
+        else:
+            handle = self._push(self.heap, self._decorate(x))
+        if self.debug:
+            assert self._isHeap(), "Priority Queue is not a Heap"
+        return handle
+
+    """
+    Replaces a key on this priority queue with one that is removed no
+    later: a smaller key, or a larger key if reverse is True.
+    Only the pairing backend supports this operation.
+
+    :param  handle: the handle returned by insert for the key to replace
+    :param  x: the new key
+    :raises TypeError: if the key is None
+    :raises ValueError: if the backend is not pairing, if the handle is not
+    on this priority queue, or if x would be removed later than the old key
+    :raises AssertionError: if debug is True and the priority queue
+    after this operation is not a heap
+    """
+    def decreaseKey(self, handle, x):
+        if self.backend != "pairing":
+            raise ValueError("decreaseKey() requires the pairing backend")
+        if x is None:
+            raise TypeError("key is None")
+        if not self.heap.contains(handle):
+            raise ValueError("handle is not on this priority queue")
+        if self.key is None:
+            self.heap.decreaseKey(handle, x)
+        else:
+            # keep the tiebreak, so the key keeps its place among equal keys
+            self.heap.decreaseKey(handle, (self.key(x), handle.entry[1], x), _rank)
+        if self.debug:
+            assert self._isHeap(), "Priority Queue is not a Heap"
+
+    """
+    Moves all the keys of another priority queue to this one.
+    Keys with equal key(x) keep the order in which they were inserted,
+    whichever priority queue they were inserted into.
+    Takes constant time with the pairing backend, and time proportional
+    to the total number of keys otherwise.
+
+    :param  other: the other priority queue, which is left empty
+    :raises ValueError: if the priority queues differ in backend, key
+    function or direction
+    :raises AssertionError: if debug is True and the priority queue
+    after this operation is not a heap
+    """
+    def meld(self, other):
+        if other.backend != self.backend or other.key is not self.key or other.reverse != self.reverse:
+            raise ValueError("cannot meld priority queues with a different backend, key or order")
+        if other is self:
+            return
+        if self.backend != "binary":
+            self.heap.meld(other.heap)
+        else:
+            self.heap.extend(other.heap)
+            other.heap.clear()
+            if self.reverse:
+                _heapifyMax(self.heap)
+            else:
+                heapq.heapify(self.heap)
+        if self.debug:
+            assert self._isHeap(), "Priority Queue is not a Heap"
+
+    """
+    Removes and returns the top key on this priority queue.
+
+    :returns: the top key on this priority queue
+    :raises KeyError: if this priority queue is empty
+    :raises AssertionError: if debug is True and the priority queue
+    after this operation is not a heap
+    """
+    def pop(self):
+        if not self.heap:
+            raise KeyError("Priority queue underflow")
+        top = self._pop(self.heap)
+        if self.debug:
+            assert self._isHeap(), "Priority Queue is not a Heap"
+        if self.key is None:
+            return top
+        return top[2]
+
+    """
+    Returns a list that contains the keys on this priority queue
+    in the order they would be removed.
+
+    :returns: a list that contains the keys on this priority queue
+    in priority order
+    """
+    def keys(self):
+        entries = self.heap if self.backend == "binary" else self.heap.entries()
+        entries = sorted(entries, reverse=self.reverse)
+        if self.key is None:
+            return entries
+        return [entry[2] for entry in entries]
+
+    """
+    Generates the keys on this priority queue in the order they would be
+    removed, without removing them or copying the heap.
+    The priority queue must not be modified while the generator is used.
+
+    :returns: a generator over the keys in priority order
+    """
+    def iterKeys(self):
+        entries = self._iterNodes() if self.backend == "pairing" else self._iterArray()
+        if self.key is None:
+            yield from entries
+        else:
+            for entry in entries:
+                yield entry[2]
+
+    """
+    Returns the first k keys on this priority queue in the order they
+    would be removed, without removing them: the k smallest keys, or
+    the k largest keys if reverse is True.
+
+    :param  k: the number of keys
+    :returns: a list of the first min(k, size()) keys in priority order
+    :raises ValueError: if k < 0
+    """
+    def topKeys(self, k: int):
+        if k < 0:
+            raise ValueError("k must be nonnegative")
+        return list(islice(self.iterKeys(), k))
+
+    # generate the entries of the binary or d-ary heap in priority order,
+    # with an auxiliary heap of (entry, position) pairs
+    def _iterArray(self):
+        heap = self.heap if self.backend == "binary" else self.heap.a
+        d = 2 if self.backend == "binary" else self.heap.d
+        push = _heappushMax if self.reverse else heapq.heappush
+        pop = _heappopMax if self.reverse else heapq.heappop
+        n = len(heap)
+        aux = [(heap[0], 0)] if n > 0 else []
+        while aux:
+            entry, i = pop(aux)
+            yield entry
+            for j in range(d * i + 1, min(d * i + d + 1, n)):
+                push(aux, (heap[j], j))
+
+    # generate the entries of the pairing heap in priority order, with an
+    # auxiliary heap of (entry, tiebreak, node) triples
+    def _iterNodes(self):
+        push = _heappushMax if self.reverse else heapq.heappush
+        pop = _heappopMax if self.reverse else heapq.heappop
+        root = self.heap.root
+        aux = [(root.entry, 0, root)] if root is not None else []
+        seq = 1
+        while aux:
+            entry, _, x = pop(aux)
+            yield entry
+            child = x.child
+            while child is not None:
+                push(aux, (child.entry, seq, child))
+                seq += 1
+                child = child.next
+
+    # is heap[0..n-1] a heap? every entry is compared with its parent
+    def _isHeap(self):
+        if self.backend != "binary":
+            return self.heap.isHeap()
+        heap = self.heap
+        for k in range(1, len(heap)):
+            if self.reverse:
+                if heap[(k - 1) // 2] < heap[k]:
+                    return False
+            elif heap[k] < heap[(k - 1) // 2]:
+                return False
+        return True
@@ -0,0 +1,148 @@
+from collections import deque
+import TextSource
+import TrieST
+
+"""
+Dependencies: TextSource.py, TrieST.py
+
+Execution:
+st = TrieST.TrieST()
+st.put("he", 1)
+st.put("she", 2)
+st.put("his", 3)
+st.put("hers", 4)
+
+ac = AhoCorasick(st)
+print(ac.search("ushers"))   # [(1, 'she', 2), (2, 'he', 1), (2, 'hers', 4)]
+
+"""
+
+"""
+The AhoCorasick class finds every occurrence of every key of a string
+symbol table in a text, in a single pass over the text.
+
+This implementation uses the Aho-Corasick automaton: a trie of the keys
+whose states are extended with failure links (the state of the longest
+proper suffix of the current state's string that is also in the trie)
+and output links (the nearest state along the failure links where a
+key ends). The automaton is built from the keys and values that the
+TrieST holds when the constructor is called; the empty key is ignored.
+Construction takes time proportional to the total length of the keys.
+A search takes time proportional to n + z, where n is the length of the
+text and z is the number of occurrences reported.
+The searchStream method carries the state of the automaton across chunk
+boundaries, so it finds occurrences that span chunks while holding only
+one chunk in memory.
+"""
+class AhoCorasick(object):
+
+    """
+    Builds the automaton for the keys of a string symbol table.
+    :param st: the symbol table whose keys are searched for
+    :raises TypeError: if st is None
+    """
+    def __init__(self, st: TrieST):
+        if st is None:
+            raise TypeError("argument to AhoCorasick() is None")
+        self.keys = []  # keys[k] = k-th key
+        self.vals = []  # vals[k] = value of the k-th key
+        self.goto = [{}] # goto[s][c] = trie child of state s for character c
+        self.out = [-1]  # out[s] = index of the key ending at state s, or -1
+        for key in st.keys():
+            if key:
+                self._add(key, st.get(key))
+        self._link()
+
+    # add key to the trie of states
+    def _add(self, key: str, val):
+        s = 0
+        for c in key:
+            nxt = self.goto[s].get(c)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.out.append(-1)
+                self.goto[s][c] = nxt
+            s = nxt
+        self.out[s] = len(self.keys)
+        self.keys.append(key)
+        self.vals.append(val)
+
+    # compute the failure and output links, in breadth-first order so that
+    # the links of shallower states are known first
+    def _link(self):
+        goto = self.goto
+        self.fail = [0] * len(goto) # fail[s] = failure link of state s
+        self.link = [0] * len(goto) # link[s] = nearest state along fail with a key, or 0
+        q = deque(goto[0].values())
+        while q:
+            s = q.popleft()
+            for c, t in goto[s].items():
+                f = self.fail[s]
+                while f and c not in goto[f]:
+                    f = self.fail[f]
+                f = goto[f].get(c, 0)
+                self.fail[t] = f
+                self.link[t] = f if self.out[f] >= 0 else self.link[f]
+                q.append(t)
+
+    """
+    Returns every occurrence of every key in the text.
+    :param txt: the text string
+    :returns: the list of (offset, key, value) triples, ordered by the
+    index at which the occurrence ends, and longest key first among
+    occurrences that end at the same index
+    """
+    def search(self, txt: str):
+        matches = []
+        self._scan(txt, 0, 0, matches)
+        return matches
+
+    """
+    Generates every occurrence of every key in a text given in chunks,
+    in the same order as search().
+    :param source: a string, an iterable of string chunks, or a file-like
+    object opened in text mode; see TextSource
+    :param chunkSize: the number of characters read at a time from a
+    file-like source
+    :returns: a generator over (offset, key, value) triples
+    :raises TypeError: if a chunk is not a string
+    :raises ValueError: if chunkSize < 1
+    """
+    def searchStream(self, source, chunkSize: int = 1 << 16):
+        s = 0      # state of the automaton at the end of the previous chunk
+        offset = 0 # index in the whole text of the start of the chunk
+        for chunk in TextSource.chunks(source, chunkSize):
+            if not isinstance(chunk, str):
+                raise TypeError("AhoCorasick searches str texts only")
+            matches = []
+            s = self._scan(chunk, s, offset, matches)
+            yield from matches
+            offset += len(chunk)
+
+    # run the automaton over txt from state s, appending the occurrences to
+    # matches with offsets relative to offset; returns the final state
+    def _scan(self, txt: str, s: int, offset: int, matches: list):
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        link = self.link
+        keys = self.keys
+        vals = self.vals
+        for i, c in enumerate(txt):
+            while s and c not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(c, 0)
+            t = s if out[s] >= 0 else link[s]
+            while t:
+                k = out[t]
+                matches.append((offset + i + 1 - len(keys[k]), keys[k], vals[k]))
+                t = link[t]
+        return s
+
+    """
+    Returns the number of keys the automaton searches for.
+    :returns: the number of keys
+    """
+    def size(self):
+        return len(self.keys)
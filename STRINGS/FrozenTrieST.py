@@ -0,0 +1,320 @@
+import mmap as mmapfile
+import pickle
+import struct
+import sys
+from array import array
+from collections import deque
+
+"""
+Dependencies: None
+
+Execution:
+st = TrieST.TrieST()
+st.put("she", 0)
+st.put("sells", 1)
+st.put("shells", 2)
+
+frozen = st.freeze()
+print(frozen.get("sells"))              # 1
+print(frozen.keysWithPrefix("sh"))      # ['she', 'shells']
+print(frozen.longestPrefixOf("shellsort")) # shells
+
+"""
+
+"""
+The FrozenTrieST class represents an immutable symbol table of key-value
+pairs, with string keys and generic values.
+Instances are normally obtained by calling freeze() on a TrieST once it
+has been built.
+
+It supports the get, contains, size, is-empty, longest prefix,
+keys, keys-with-prefix and keys-that-match operations of TrieST, with
+the same results and the same key order.
+
+The nodes of the trie are numbered in breadth-first order, so the
+children of every node are numbered consecutively, and the trie is
+stored in three flat arrays instead of a Python object and a dictionary
+per node:
+ first[x] is the number of the first child of node x, so the children
+ of x are first[x] through first[x+1] - 1,
+ labels[y] is the character on the link into node y, so the child of x
+ for character c is found with labels.find(c, first[x], first[x+1]),
+ index[x] is the index in vals of the value of node x, or -1.
+Each node costs two 4-byte ints and one character of labels, about an
+order of magnitude less than a TrieST.Node.
+The get, contains and longest prefix operations take time proportional
+to the length of the key times the number of children of the nodes on
+its path (in the worst case).
+
+A FrozenTrieST can be saved to a binary snapshot file made of a 40-byte
+header (magic, version, flags, number of nodes, number of keys and the
+length of the labels), followed by first and index as little-endian
+int32, the labels encoded in UTF-8 and the values pickled. Loading a
+snapshot with mmap=True maps the file and serves first and index
+straight from the mapped pages; the labels and values are decoded.
+Only load snapshots from trusted sources, since the values are
+unpickled.
+"""
+class FrozenTrieST(object):
+    MAGIC = b"ALGS4FTR"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIqqq") # magic, version, flags, nodes, keys, length of labels
+
+    """
+    Initializes a symbol table from its arrays.
+
+    :param  first: nodes + 1 nondecreasing offsets of the first children
+    :param  labels: the string of the characters on the links into the nodes
+    :param  index: the indices in vals of the values of the nodes, or -1
+    :param  vals: the values
+    :raises ValueError: if the arrays are inconsistent
+    """
+    def __init__(self, first, labels: str, index, vals: list):
+        nodes = len(index)
+        if nodes == 0 or len(first) != nodes + 1 or len(labels) != nodes or first[nodes] != nodes:
+            raise ValueError("arrays are inconsistent with the number of nodes")
+        self.first = first   # first[x] = first child of node x
+        self.labels = labels # labels[y] = character on the link into node y
+        self.index = index   # index[x] = index in vals of the value of node x, or -1
+        self.vals = vals
+        self.n = len(vals)   # number of keys
+
+    """
+    Builds a FrozenTrieST from the nodes of a TrieST, numbering them in
+    breadth-first order and keeping the order of the children of every node.
+
+    :param  root: the root node of the trie, or None
+    :returns: the frozen symbol table
+    """
+    @staticmethod
+    def fromTrie(root):
+        first = array('i')
+        labels = ["\0"] # the root has no incoming link
+        index = array('i')
+        vals = []
+        q = deque([root])
+        while q:
+            x = q.popleft()
+            # the children of x are numbered from the number of nodes seen so far
+            first.append(len(labels))
+            if x is None or x.val is None:
+                index.append(-1)
+            else:
+                index.append(len(vals))
+                vals.append(x.val)
+            if x is None:
+                continue
+            for c, child in x.next.items():
+                if child is not None:
+                    labels.append(c)
+                    q.append(child)
+        first.append(len(labels))
+        return FrozenTrieST(first, "".join(labels), index, vals)
+
+    # returns the node of key, or -1 if there is none
+    def _get(self, key: str):
+        first = self.first
+        labels = self.labels
+        x = 0
+        for c in key:
+            x = labels.find(c, first[x], first[x + 1])
+            if x < 0:
+                return -1
+        return x
+
+    """
+    Returns the value associated with the given key.
+    :param key: the key
+    :returns: the value associated with the given key if the key is in the symbol table
+    and None if the key is not in the symbol table
+    :raises TypeError: if argument is None
+    """
+    def get(self, key: str):
+        if key is None:
+            raise TypeError("argument to get() is None")
+        x = self._get(key)
+        if x < 0 or self.index[x] < 0:
+            return None
+        return self.vals[self.index[x]]
+
+    """
+    Does this symbol table contain the given key?
+    :param key: the key
+    :returns: true if this symbol table contains key and
+    false otherwise
+    :raises TypeError: if argument is None
+    """
+    def contains(self, key: str):
+        if key is None:
+            raise TypeError("argument to contains() is None")
+        x = self._get(key)
+        return x >= 0 and self.index[x] >= 0
+
+    """
+    Returns the number of key-value pairs in this symbol table.
+    :returns: the number of key-value pairs in this symbol table
+    """
+    def size(self):
+        return self.n
+
+    """
+    Is this symbol table empty?
+    :returns: true if this symbol table is empty and false otherwise
+    """
+    def isEmpty(self):
+        return self.size() == 0
+
+    """
+    Returns the string in the symbol table that is the longest prefix of query,
+    or None, if no such string.
+    :param query: the query string
+    :returns: the string in the symbol table that is the longest prefix of query,
+    or None if no such string
+    :raises TypeError: if argument is None
+    """
+    def longestPrefixOf(self, query: str):
+        if query is None:
+            raise TypeError("argument of longestPrefixOf() is None")
+        first = self.first
+        labels = self.labels
+        index = self.index
+        length = 0 if index[0] >= 0 else -1
+        x = 0
+        for d, c in enumerate(query):
+            x = labels.find(c, first[x], first[x + 1])
+            if x < 0:
+                break
+            if index[x] >= 0:
+                length = d + 1
+        if length == -1:
+            return None
+        return query[0:length]
+
+    """
+    Returns all keys in the symbol table as a list.
+    :returns: all keys in the symbol table as a list
+    """
+    def keys(self):
+        return self.keysWithPrefix("")
+
+    """
+    Returns all of the keys in the set that start with a given prefix.
+    :param prefix: the prefix
+    :returns: all of the keys in the set that start with a given prefix,
+    as a list
+    """
+    def keysWithPrefix(self, prefix: str):
+        results = []
+        x = self._get(prefix)
+        if x >= 0:
+            self._collect(x, prefix, results)
+        return results
+
+    # preorder, with the children pushed in reverse so that they are
+    # visited in order
+    def _collect(self, x: int, prefix: str, results: list):
+        first = self.first
+        labels = self.labels
+        index = self.index
+        stack = [(x, prefix)]
+        while stack:
+            x, prefix = stack.pop()
+            if index[x] >= 0:
+                results.append(prefix)
+            for y in range(first[x + 1] - 1, first[x] - 1, -1):
+                stack.append((y, prefix + labels[y]))
+
+    """
+    Returns all of the keys in the symbol table that match specified pattern,
+    where . symbol is treated as a wildcard character.
+    :param pattern: the pattern
+    :returns: all of the keys in the symbol table that match specified pattern,
+    as a list, where . is treated as a wildcard character.
+    """
+    def keysThatMatch(self, pattern: str):
+        first = self.first
+        labels = self.labels
+        index = self.index
+        results = []
+        stack = [(0, "")]
+        while stack:
+            x, prefix = stack.pop()
+            d = len(prefix)
+            if d == len(pattern):
+                if index[x] >= 0:
+                    results.append(prefix)
+                continue
+            c = pattern[d]
+            if c == ".":
+                for y in range(first[x + 1] - 1, first[x] - 1, -1):
+                    stack.append((y, prefix + labels[y]))
+            else:
+                y = labels.find(c, first[x], first[x + 1])
+                if y >= 0:
+                    stack.append((y, prefix + c))
+        return results
+
+    """
+    Writes this symbol table to a binary snapshot file.
+
+    :param  path: the path of the file
+    """
+    def save(self, path: str):
+        first = array('i', self.first)
+        index = array('i', self.index)
+        if sys.byteorder != "little":
+            first.byteswap()
+            index.byteswap()
+        labels = self.labels.encode("utf-8", "surrogatepass")
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0, len(index), self.n, len(labels)))
+            first.tofile(f)
+            index.tofile(f)
+            f.write(labels)
+            pickle.dump(list(self.vals), f, pickle.HIGHEST_PROTOCOL)
+
+    """
+    Reads a symbol table from a binary snapshot file written by save().
+    With mmap=True the file is memory-mapped read-only and first and
+    index are views of the mapped file. Otherwise they are read into memory.
+
+    :param  path: the path of the file
+    :param  mmap: True to memory-map the file instead of reading it
+    :returns: the symbol table, as a FrozenTrieST
+    :raises ValueError: if the file is not a snapshot or is truncated
+    """
+    @staticmethod
+    def load(path: str, mmap: bool = True):
+        header = FrozenTrieST.HEADER
+        with open(path, "rb") as f:
+            magic, version, flags, nodes, n, m = header.unpack(f.read(header.size).ljust(header.size, b"\0"))
+            if magic != FrozenTrieST.MAGIC or version != FrozenTrieST.VERSION:
+                raise ValueError(path + " is not a version " + str(FrozenTrieST.VERSION) + " trie snapshot")
+            start = header.size + 4 * (nodes + 1) + 4 * nodes
+            try:
+                if mmap and sys.byteorder == "little":
+                    buf = memoryview(mmapfile.mmap(f.fileno(), 0, access=mmapfile.ACCESS_READ))
+                    if len(buf) < start + m:
+                        raise ValueError(path + " is truncated")
+                    first = buf[header.size:header.size + 4 * (nodes + 1)].cast('i')
+                    index = buf[header.size + 4 * (nodes + 1):start].cast('i')
+                    labels = str(buf[start:start + m], "utf-8", "surrogatepass")
+                    vals = pickle.loads(buf[start + m:])
+                else:
+                    first = array('i')
+                    index = array('i')
+                    first.fromfile(f, nodes + 1)
+                    index.fromfile(f, nodes)
+                    if sys.byteorder != "little":
+                        first.byteswap()
+                        index.byteswap()
+                    labels = f.read(m)
+                    if len(labels) < m:
+                        raise ValueError(path + " is truncated")
+                    labels = labels.decode("utf-8", "surrogatepass")
+                    vals = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                raise ValueError(path + " is truncated")
+        if len(vals) != n:
+            raise ValueError(path + " is truncated")
+        return FrozenTrieST(first, labels, index, vals)
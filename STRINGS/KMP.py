@@ -1,53 +1,476 @@
+import mmap
+import multiprocessing
+import os
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+import TextSource
+
 """
-The KMP class finds the first occurrence of a pattern string
-in a text string.
+Dependencies: TextSource.py
+
+Execution:
+kmp = KMP("abra")
+print(list(kmp.searchStream(["abracad", "abra"])))         # [0, 7]
+
+# buffers are scanned in memoryview slices of chunkSize bytes
+print(list(kmp.searchStream(memoryview(b"cadabra"), 4)))  # [3]
+
+with open("abra.txt", "wb") as f:
+    f.write(b"abracadabra")
+with open("abra.txt", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as text:
+    print(list(kmp.searchStream(text, 4)), text.tell())     # [0, 7] 0
+
+"""
+
+"""
+The KMP class finds the first occurrence, or every occurrence, of a
+pattern string in a text string, or in a text that arrives in chunks.
 
 This implementation uses a version of the Knuth-Morris-Pratt substring search
-algorithm. The version takes time proportional to n + mR
-in the worst case, where n is the length of the text string,
-m is the length of the pattern, and R is the alphabet size.
-It uses extra space proportional to mR.
+algorithm. The pattern is compiled into one of three representations,
+selected with the mode argument of the constructor:
+
+ dfa:     the deterministic finite-state automaton over the full alphabet of
+          size R, as a list of R lists of m states. The search takes time
+          proportional to n + mR in the worst case, where n is the length of
+          the text string, m is the length of the pattern, and R is the
+          alphabet size. It uses extra space proportional to mR.
+          Characters of the pattern outside the alphabet are remapped to
+          extra rows, and characters of the text outside the alphabet that
+          do not occur in the pattern share one row of zeros, so patterns
+          and texts may use any Unicode characters.
+ packed:  the same automaton restricted to the characters that occur in the
+          pattern, one compact array of m states per distinct pattern
+          character; any other text character sends the automaton back to
+          state 0. It uses extra space proportional to m times the number of
+          distinct pattern characters, and the search is as fast as dfa.
+ failure: the Knuth-Morris-Pratt failure function, one array of m entries.
+          It uses extra space proportional to m, and the search takes time
+          proportional to n + m.
+
+All three representations give the same results.
+
+The searchStream method scans a text given as a sequence of chunks (an
+iterable of strings or bytes, or a file-like object with a read method),
+or a bytes-like text in memoryview slices,
+and carries the state of the automaton from one chunk to the next, so it
+finds every occurrence, including those that span chunk boundaries,
+using extra space proportional to the chunk size only.
+
+Texts may be strings or bytes-like objects: bytes, bytearray, memoryview,
+mmap, or anything else that exports a buffer. Bytes-like texts are
+scanned in place, through a memoryview, without copying or decoding,
+and are matched against the UTF-8 encoding of a string pattern; the
+indices returned for them are byte offsets.
+
+The searchParallel and searchFileParallel methods split a text, or a
+file that every worker maps into memory, into ranges that overlap by
+m - 1 characters and scan them in a pool of processes. Each range
+reports only the occurrences that start inside it, so the merged result
+is the same as that of searchAll.
+
+The module-level compile function returns a shared KMP object for a
+pattern from a bounded least-recently-used cache, so that a pattern
+used over and over is preprocessed once per process. Shared matchers
+must not be modified.
 """
 class KMP(object):
+    MODES = ("dfa", "packed", "failure")
 
     """
     Preprocesses the pattern string.
-    
-    :param pat: the pattern string
+
+    :param pat: the pattern string, or a bytes pattern to search byte texts
+    :param mode: the compiled representation, "dfa", "packed" or "failure"
+    :raises ValueError: if mode is not one of MODES
     """
-    def __init__(self, pat: str):
+    def __init__(self, pat: str, mode: str = "dfa"):
+        if mode not in self.MODES:
+            raise ValueError("mode must be one of " + ", ".join(self.MODES))
         self.R = 256
-        self.pat = pat 
+        self.pat = pat
+        self.mode = mode
+        self._bytes = None # matcher for the UTF-8 encoding of pat, built on first use
+        if mode == "dfa":
+            self._buildDFA()
+        elif mode == "packed":
+            self._buildPacked()
+        else:
+            self._buildFailure()
+
+    # build DFA from pattern; pattern characters >= R get extra rows through
+    # remap, and the last row, all zeros, serves every other character >= R
+    def _buildDFA(self):
+        self.remap = {}
+        pat = []
+        for c in self._codes(self.pat):
+            if c >= self.R:
+                c = self.remap.setdefault(c, self.R + len(self.remap))
+            pat.append(c)
+        m = len(pat)
+        self.dfa = [[0 for i in range(m)] for j in range(self.R + len(self.remap) + 1)]
+        self.dfa[ pat[0] ][0] = 1
+        x = 0
+        for j in range(1, m):
+            for c in range(len(self.dfa)):
+                self.dfa[c][j] = self.dfa[c][x] # Copy mismatch cases.
+            self.dfa[ pat[j] ][j] = j+1         # Set match case.
+            x = self.dfa[ pat[j] ][x]           # Update restart state.
+        self.restart = x # state to resume from after a match
 
-        # build DFA from pattern
+    # build DFA from pattern, with one row per distinct pattern character;
+    # the states fit in the smallest array type that can hold m
+    def _buildPacked(self):
+        pat = self.pat
         m = len(pat)
-        self.dfa = [[0 for i in range(m)] for j in range(self.R)]
-        self.dfa[ ord(pat[0]) ][0] = 1  
+        typecode = "B" if m < 1 << 8 else "H" if m < 1 << 16 else "i"
+        self.rows = {}
+        for ch in pat:
+            if ch not in self.rows:
+                self.rows[ch] = array(typecode, [0]) * m
+        self.rows[pat[0]][0] = 1
         x = 0
         for j in range(1, m):
-            for c in range(self.R):
-                self.dfa[c][j] = self.dfa[c][x] # Copy mismatch cases. 
-            self.dfa[ ord(pat[j]) ][j] = j+1    # Set match case. 
-            x = self.dfa[ ord(pat[j]) ][x]      # Update restart state. 
+            for row in self.rows.values():
+                row[j] = row[x]          # Copy mismatch cases.
+            self.rows[pat[j]][j] = j+1   # Set match case.
+            x = self.rows[pat[j]][x]     # Update restart state.
+        self.restart = x # state to resume from after a match
+
+    # build the failure function: fail[j] = length of the longest proper
+    # prefix of pat[0..j] that is also a suffix of pat[0..j]
+    def _buildFailure(self):
+        pat = self.pat
+        m = len(pat)
+        if m == 0:
+            raise IndexError("pattern is empty")
+        self.fail = array("i", [0]) * m
+        k = 0
+        for j in range(1, m):
+            while k > 0 and pat[j] != pat[k]:
+                k = self.fail[k - 1]
+            if pat[j] == pat[k]:
+                k += 1
+            self.fail[j] = k
+        self.restart = self.fail[m - 1] # state to resume from after a match
+
+    # the character codes of a string, or the bytes of a bytes-like object
+    @staticmethod
+    def _codes(txt):
+        if isinstance(txt, str):
+            return list(map(ord, txt))
+        return txt
 
 
     """
     Returns the index of the first occurrrence of the pattern string
     in the text string.
 
-    :param  txt: the text string
+    :param  txt: the text string, or a bytes-like text
     :returns: the index of the first occurrence of the pattern string
     in the text string;  n if no such match
     """
     def search(self, txt: str):
+        matcher, txt = self._matcherFor(txt)
+        ends = []
+        matcher._scan(txt, 0, ends, True)
+        if ends:
+            return ends[0] - len(matcher.pat) # found
+        return len(txt)                       # not found
+
+    """
+    Returns the indices of all the occurrences of the pattern string in
+    the text string, including overlapping ones, in increasing order.
 
-        # simulate operation of DFA on text
+    :param  txt: the text string, or a bytes-like text
+    :returns: the list of the indices of the occurrences
+    """
+    def searchAll(self, txt: str):
+        matcher, txt = self._matcherFor(txt)
+        m = len(matcher.pat)
+        ends = []
+        matcher._scan(txt, 0, ends, False)
+        return [end - m for end in ends]
+
+    """
+    Returns the indices of all the occurrences of the pattern string in
+    the text, like searchAll, scanning ranges of the text in parallel.
+    With the fork start method the workers inherit the text; otherwise
+    it is sent to each worker once.
+
+    :param  txt: the text string, or a bytes-like text
+    :param  processes: the number of worker processes; defaults to the
+    number of CPUs
+    :param  chunkSize: the number of characters (or bytes) per range
+    :returns: the list of the indices of the occurrences, in increasing order
+    """
+    def searchParallel(self, txt: str, processes: int = None, chunkSize: int = 1 << 20):
+        matcher, txt = self._matcherFor(txt)
+        if not isinstance(txt, (str, bytes)) and multiprocessing.get_start_method() != "fork":
+            txt = bytes(txt)
+        return self._parallel(txt, None, len(txt), processes, chunkSize)
+
+    """
+    Returns the byte offsets of all the occurrences of the pattern in a
+    file, scanning ranges of the file in parallel. Each worker maps the
+    file into memory itself, so no part of the file is copied between
+    processes. A string pattern is matched against its UTF-8 encoding.
+
+    :param  path: the path of the file
+    :param  processes: the number of worker processes; defaults to the
+    number of CPUs
+    :param  chunkSize: the number of bytes per range
+    :returns: the list of the byte offsets of the occurrences, in
+    increasing order
+    """
+    def searchFileParallel(self, path: str, processes: int = None, chunkSize: int = 1 << 24):
+        return self._parallel(None, path, os.path.getsize(path), processes, chunkSize)
+
+    # scan [0, n) of txt, or of the file at path, in ranges of chunkSize
+    def _parallel(self, txt, path: str, n: int, processes: int, chunkSize: int):
+        if chunkSize < 1:
+            raise ValueError("chunk size must be positive")
+        if processes is None:
+            processes = os.cpu_count() or 1
+        ranges = [(start, min(start + chunkSize, n)) for start in range(0, n, chunkSize)]
+        processes = max(1, min(processes, len(ranges)))
+        if processes == 1:
+            if path is None:
+                return self.searchAll(txt)
+            if n == 0:
+                return []
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.searchAll(data)
+        initargs = (self.pat, self.mode, txt, path)
+        with multiprocessing.Pool(processes, _parallelInit, initargs) as pool:
+            found = pool.map(_parallelScan, ranges)
+        return [i for offsets in found for i in offsets]
+
+    """
+    Generates the indices of all the occurrences of the pattern string in
+    a text given in chunks, in increasing order. The state of the
+    automaton is carried across chunk boundaries, so no occurrence is
+    missed, and only one chunk is held in memory at a time.
+    For byte chunks the pattern is encoded as UTF-8 and the indices are
+    byte offsets.
+
+    :param  source: a string, a bytes-like object (bytes, bytearray,
+    memoryview, mmap, ...), an iterable of str or bytes-like chunks, or
+    a file-like object with a read method (a file opened in text or
+    binary mode, or the result of socket.makefile); see TextSource
+    :param  chunkSize: the number of bytes of a bytes-like source scanned
+    at a time, or the number of characters (or bytes) read at a time
+    from a file-like source
+    :returns: a generator over the indices of the occurrences
+    :raises TypeError: if byte and string chunks are mixed, or if the
+    chunks are strings and the pattern is bytes
+    :raises ValueError: if chunkSize < 1
+    """
+    def searchStream(self, source, chunkSize: int = 1 << 16):
+        matcher = None
+        j = 0      # state of the automaton at the end of the previous chunk
+        offset = 0 # index in the whole text of the start of the chunk
+        for chunk in TextSource.chunks(source, chunkSize):
+            if matcher is None:
+                matcher, chunk = self._matcherFor(chunk)
+            elif isinstance(chunk, str) != isinstance(matcher.pat, str):
+                raise TypeError("text mixes str and bytes chunks")
+            elif not isinstance(chunk, str):
+                chunk = self._byteView(chunk)
+            ends = []
+            j = matcher._scan(chunk, j, ends, False)
+            m = len(matcher.pat)
+            for end in ends:
+                yield offset + end - m
+            offset += len(chunk)
+
+    # the matcher for txt, and txt itself or a byte view of it
+    def _matcherFor(self, txt):
+        if isinstance(txt, str):
+            if not isinstance(self.pat, str):
+                raise TypeError("cannot search a str text for a bytes pattern")
+            return self, txt
+        return self._byteMatcher(), self._byteView(txt)
+
+    # the bytes of a bytes-like object, without copying them
+    @staticmethod
+    def _byteView(txt):
+        if isinstance(txt, (bytes, bytearray)):
+            return txt
+        view = memoryview(txt)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        return view
+
+    # the matcher for byte texts: this one for a bytes pattern, otherwise
+    # one for the UTF-8 encoding of the pattern, built on first use
+    def _byteMatcher(self):
+        if not isinstance(self.pat, str):
+            return self
+        if self._bytes is None:
+            self._bytes = KMP(self.pat.encode("utf-8"), self.mode)
+        return self._bytes
+
+    # run the automaton over txt from state j, appending to ends the index
+    # just past each occurrence; stops after the first one if first is True;
+    # returns the state at the end of txt
+    def _scan(self, txt, j: int, ends: list, first: bool):
         m = len(self.pat)
-        n = len(txt) 
-        i = j = 0
-        while i < n and j < m:
-            j = self.dfa[ ord(txt[i]) ][j] 
-            i += 1
-        if j == m:
-            return i - m     # found
-        return n             # not found
\ No newline at end of file
+        restart = self.restart
+        if self.mode == "dfa":
+            # simulate operation of DFA on text
+            dfa = self.dfa
+            R = self.R
+            remap = self.remap
+            other = len(dfa) - 1
+            for i, c in enumerate(map(ord, txt) if isinstance(txt, str) else txt):
+                if c >= R:
+                    c = remap.get(c, other)
+                j = dfa[c][j]
+                if j == m:
+                    ends.append(i + 1)
+                    if first:
+                        return j
+                    j = restart
+        elif self.mode == "packed":
+            # simulate operation of the packed DFA on text
+            rows = self.rows
+            for i, ch in enumerate(txt):
+                row = rows.get(ch)
+                j = row[j] if row is not None else 0
+                if j == m:
+                    ends.append(i + 1)
+                    if first:
+                        return j
+                    j = restart
+        else:
+            # run the failure function automaton on text
+            pat = self.pat
+            fail = self.fail
+            for i, ch in enumerate(txt):
+                while j > 0 and ch != pat[j]:
+                    j = fail[j - 1]
+                if ch == pat[j]:
+                    j += 1
+                    if j == m:
+                        ends.append(i + 1)
+                        if first:
+                            return j
+                        j = restart
+        return j
+
+
+########################################################################
+# Workers of searchParallel and searchFileParallel.
+########################################################################
+
+_parallelState = {}
+
+def _parallelInit(pat, mode: str, txt, path: str):
+    matcher = compile(pat, mode)
+    if path is not None:
+        f = open(path, "rb")
+        if os.path.getsize(path) > 0:
+            _parallelState["map"] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            txt = memoryview(_parallelState["map"])
+        else:
+            txt = b""
+        f.close()
+    if not isinstance(txt, str):
+        matcher = matcher._byteMatcher()
+        txt = KMP._byteView(txt)
+    _parallelState["matcher"] = matcher
+    _parallelState["txt"] = txt
+
+# the occurrences that start in [start, end), found by scanning
+# [start, end + m - 1) so that occurrences crossing end are complete
+def _parallelScan(task):
+    start, end = task
+    matcher = _parallelState["matcher"]
+    txt = _parallelState["txt"]
+    m = len(matcher.pat)
+    ends = []
+    matcher._scan(txt[start:min(end + m - 1, len(txt))], 0, ends, False)
+    return [start + e - m for e in ends]
+
+
+########################################################################
+# Compiled-pattern cache.
+########################################################################
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_cache = OrderedDict()  # (pattern, mode) -> KMP, least recently used first
+_cacheSize = 256        # maximum number of cached matchers
+_hits = 0
+_misses = 0
+_cacheLock = threading.Lock()
+
+"""
+Returns a KMP matcher for the pattern, from the cache if the same
+pattern was compiled with the same mode recently, or a new one, which is
+then cached, evicting the least recently used matcher if the cache is
+full. The matcher is shared with every other caller of compile for the
+same pattern and must not be modified.
+
+:param pat: the pattern string, or a bytes pattern
+:param mode: the compiled representation, "dfa", "packed" or "failure"
+:returns: the matcher
+:raises ValueError: if mode is not one of KMP.MODES
+"""
+def compile(pat: str, mode: str = "dfa"):
+    global _hits, _misses
+    key = (pat, mode)
+    with _cacheLock:
+        matcher = _cache.get(key)
+        if matcher is not None:
+            _cache.move_to_end(key)
+            _hits += 1
+            return matcher
+        _misses += 1
+    # preprocess outside the lock; two threads may both build the matcher
+    matcher = KMP(pat, mode)
+    with _cacheLock:
+        if _cacheSize > 0:
+            _cache[key] = matcher
+            _cache.move_to_end(key)
+            while len(_cache) > _cacheSize:
+                _cache.popitem(last=False)
+    return matcher
+
+"""
+Returns the hit and miss counters, the capacity and the current size of
+the compiled-pattern cache.
+
+:returns: a CacheInfo(hits, misses, maxsize, currsize) tuple
+"""
+def cacheInfo():
+    with _cacheLock:
+        return CacheInfo(_hits, _misses, _cacheSize, len(_cache))
+
+"""
+Sets the capacity of the compiled-pattern cache, evicting the least
+recently used matchers if the cache holds more; 0 disables caching.
+
+:param maxsize: the maximum number of cached matchers
+:raises ValueError: if maxsize < 0
+"""
+def setCacheSize(maxsize: int):
+    global _cacheSize
+    if maxsize < 0:
+        raise ValueError("cache size must be nonnegative")
+    with _cacheLock:
+        _cacheSize = maxsize
+        while len(_cache) > _cacheSize:
+            _cache.popitem(last=False)
+
+"""
+Empties the compiled-pattern cache and resets its counters.
+"""
+def clearCache():
+    global _hits, _misses
+    with _cacheLock:
+        _cache.clear()
+        _hits = 0
+        _misses = 0
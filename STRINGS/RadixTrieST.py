@@ -0,0 +1,306 @@
+"""
+A string symbol table, implemented with a radix (Patricia) trie.
+
+The RadixTrieST class represents an symbol table of key-value
+pairs, with string keys and generic values.
+
+It supports the usual methods:
+ put,
+ get,
+ contains,
+ delete,
+ size,
+ is-empty
+
+It also provides methods for:
+ finding the string in the symbol table that is the longest prefix of a given prefix,
+ finding all strings in the symbol table that start with a given prefix,
+ finding all strings in the symbol table that match a given pattern.
+
+A symbol table implements the associative array abstraction:
+when associating a value with a key that is already in the symbol table,
+the convention is to replace the old value with the new value.
+This class uses the convention that values cannot be None; setting the
+value associated with a key to None is equivalent to deleting the key
+from the symbol table.
+
+This implementation uses a path-compressed trie: every link is labeled
+with a nonempty substring instead of a single character, and every node
+other than the root holds a value or has at least two children, so the
+number of nodes is at most twice the number of keys.
+The children of a node are indexed by the first character of their label.
+put splits a label where a new key branches off, and delete merges a node
+that is left with no value and a single child into that child.
+The put, get, contains, delete, and longest prefix operations take time
+proportional to the length of the key (in the worst case), but they visit
+one node per branching point instead of one node per character, and
+compare labels with string operations.
+The keys are returned in the same order as TrieST.
+The size, and is-empty operations take constant time.
+Construction takes constant time.
+"""
+class RadixTrieST(object):
+
+    # trie node
+    class Node:
+        __slots__ = ("label", "val", "next")
+
+        def __init__(self, label: str, val=None):
+            self.label = label # substring on the link into this node
+            self.val = val
+            self.next = {}     # next[c] = child whose label starts with c
+
+    # Initializes an empty string symbol table.
+    def __init__(self):
+        self.root = self.Node("") # root of trie
+        self.n = 0                # number of keys in trie
+
+    """
+    Returns the value associated with the given key.
+    :param key: the key
+    :returns: the value associated with the given key if the key is in the symbol table
+    and None if the key is not in the symbol table
+    :raises TypeError: if argument is None
+    """
+    def get(self, key: str):
+        if key is None:
+            raise TypeError("argument to get() is None")
+        x = self._get(key)
+        if x is None:
+            return None
+        return x.val
+
+    # returns the node whose path is key, or None if there is none
+    def _get(self, key: str):
+        x = self.root
+        d = 0
+        while d < len(key):
+            x = x.next.get(key[d])
+            if x is None or not key.startswith(x.label, d):
+                return None
+            d += len(x.label)
+        return x
+
+    """
+    Does this symbol table contain the given key?
+    :param key: the key
+    :returns: true if this symbol table contains key and
+    false otherwise
+    :raises TypeError: if argument is None
+    """
+    def contains(self, key: str):
+        if key is None:
+            raise TypeError("argument to contains() is None")
+        return self.get(key) is not None
+
+    """
+    Inserts the key-value pair into the symbol table, overwriting the old value
+    with the new value if the key is already in the symbol table.
+    If the value is None, this effectively deletes the key from the symbol table.
+    :param key: the key
+    :param val: the val
+    :raises TypeError: if argument is None
+    """
+    def put(self, key: str, val):
+        if key is None:
+            raise TypeError("first argument to put() is None")
+        if val is None:
+            self.delete(key)
+            return
+        x = self.root
+        d = 0
+        while d < len(key):
+            c = key[d]
+            child = x.next.get(c)
+            if child is None:
+                x.next[c] = self.Node(key[d:], val)
+                self.n += 1
+                return
+            label = child.label
+            if not key.startswith(label, d):
+                # split the label of child where key branches off
+                k = self._common(label, key, d)
+                mid = self.Node(label[:k])
+                child.label = label[k:]
+                mid.next[child.label[0]] = child
+                x.next[c] = mid
+                child = mid
+            d += len(child.label)
+            x = child
+        if x.val is None:
+            self.n += 1
+        x.val = val
+
+    # returns the length of the longest common prefix of label and key[d:]
+    @staticmethod
+    def _common(label: str, key: str, d: int):
+        k = 0
+        m = min(len(label), len(key) - d)
+        while k < m and label[k] == key[d + k]:
+            k += 1
+        return k
+
+    """
+    Returns the number of key-value pairs in this symbol table.
+    :returns: the number of key-value pairs in this symbol table
+    """
+    def size(self):
+        return self.n
+
+    """
+    Is this symbol table empty?
+    :returns: true if this symbol table is empty and false otherwise
+    """
+    def isEmpty(self):
+        return self.size() == 0
+
+    """
+    Removes the key from the set if the key is present.
+    :param key: the key
+    :raises TypeError: if argument is None
+    """
+    def delete(self, key: str):
+        if key is None:
+            raise TypeError("argument of delete() is None")
+        grandparent = None
+        parent = None
+        x = self.root
+        d = 0
+        while d < len(key):
+            grandparent = parent
+            parent = x
+            x = x.next.get(key[d])
+            if x is None or not key.startswith(x.label, d):
+                return
+            d += len(x.label)
+        if x.val is None:
+            return
+        x.val = None
+        self.n -= 1
+        if parent is None:
+            return
+
+        # remove x if it is a leaf, and merge the node left with no value
+        # and a single child into that child
+        if not x.next:
+            del parent.next[x.label[0]]
+            if parent is not self.root and parent.val is None and len(parent.next) == 1:
+                self._merge(grandparent, parent)
+        elif len(x.next) == 1:
+            self._merge(parent, x)
+
+    # replaces x, a child of parent with a single child, by that child
+    @staticmethod
+    def _merge(parent: Node, x: Node):
+        for child in x.next.values():
+            child.label = x.label + child.label
+            parent.next[x.label[0]] = child
+
+    """
+    Returns the string in the symbol table that is the longest prefix of query,
+    or None, if no such string.
+    :param query: the query string
+    :returns: the string in the symbol table that is the longest prefix of query,
+    or None if no such string
+    :raises TypeError: if argument is None
+    """
+    def longestPrefixOf(self, query: str):
+        if query is None:
+            raise TypeError("argument of longestPrefixOf() is None")
+        x = self.root
+        length = 0 if x.val is not None else -1
+        d = 0
+        while d < len(query):
+            x = x.next.get(query[d])
+            if x is None or not query.startswith(x.label, d):
+                break
+            d += len(x.label)
+            if x.val is not None:
+                length = d
+        if length == -1:
+            return None
+        return query[0:length]
+
+    """
+    Returns all keys in the symbol table as a list.
+    :returns: all keys in the symbol table as a list
+    """
+    def keys(self):
+        return self.keysWithPrefix("")
+
+    """
+    Returns all of the keys in the set that start with a given prefix.
+    :param prefix: the prefix
+    :returns: all of the keys in the set that start with a given prefix,
+    as a list
+    """
+    def keysWithPrefix(self, prefix: str):
+        results = []
+        x = self.root
+        d = 0
+        # find the node at or below the end of prefix
+        while d < len(prefix):
+            x = x.next.get(prefix[d])
+            if x is None:
+                return results
+            label = x.label
+            if prefix.startswith(label, d):
+                d += len(label)
+            elif label.startswith(prefix[d:]):
+                prefix = prefix[:d] + label
+                d = len(prefix)
+            else:
+                return results
+        self._collect(x, prefix, results)
+        return results
+
+    def _collect(self, x: Node, prefix: str, results: list):
+        # preorder, with the children pushed in reverse so that they are
+        # visited in the order of x.next
+        stack = [(x, prefix)]
+        while stack:
+            x, prefix = stack.pop()
+            if x.val is not None:
+                results.append(prefix)
+            for child in reversed(x.next.values()):
+                stack.append((child, prefix + child.label))
+
+    """
+    Returns all of the keys in the symbol table that match specified pattern,
+    where . symbol is treated as a wildcard character.
+    :param pattern: the pattern
+    :returns: all of the keys in the symbol table that match specified pattern,
+    as a list, where . is treated as a wildcard character.
+    """
+    def keysThatMatch(self, pattern: str):
+        results = []
+        stack = [(self.root, "")]
+        while stack:
+            x, prefix = stack.pop()
+            d = len(prefix)
+            if d == len(pattern):
+                if x.val is not None:
+                    results.append(prefix)
+                continue
+            c = pattern[d]
+            if c == ".":
+                children = reversed(x.next.values())
+            elif c in x.next:
+                children = (x.next[c],)
+            else:
+                continue
+            for child in children:
+                if self._matches(child.label, pattern, d):
+                    stack.append((child, prefix + child.label))
+        return results
+
+    # does label match pattern[d:d + len(label)], with . as a wildcard?
+    @staticmethod
+    def _matches(label: str, pattern: str, d: int):
+        if d + len(label) > len(pattern):
+            return False
+        for k, c in enumerate(label):
+            p = pattern[d + k]
+            if p != c and p != ".":
+                return False
+        return True
@@ -0,0 +1,67 @@
+"""
+Dependencies: None
+
+Execution:
+print(list(chunks(["ab", "", "c"], 4)))              # ['ab', 'c']
+print([bytes(c) for c in chunks(b"abcdefghij", 4)])  # [b'abcd', b'efgh', b'ij']
+
+"""
+
+"""
+Splits the text sources accepted by the searchStream methods of KMP and
+AhoCorasick into chunks.
+
+A source is one of:
+ a string, which is a single chunk,
+ an object that exports a buffer (bytes, bytearray, memoryview, mmap,
+ array, ...), which is viewed as one run of bytes and split into
+ memoryview slices of chunkSize bytes, so it is neither copied nor
+ read: the file position of an mmap is left where it was,
+ a file-like object with a read method, whose read(chunkSize) results
+ are the chunks, or
+ any other iterable, whose nonempty elements are the chunks.
+"""
+
+
+"""
+Generates the chunks of a text source.
+
+:param source: a string, a bytes-like object, a file-like object with a
+read method, or an iterable of chunks
+:param chunkSize: the number of bytes of a buffer per chunk, or the
+number of characters (or bytes) read at a time from a file-like source
+:returns: a generator over the nonempty chunks
+:raises ValueError: if chunkSize < 1
+"""
+def chunks(source, chunkSize: int):
+    if chunkSize < 1:
+        raise ValueError("chunkSize must be positive")
+    if isinstance(source, str):
+        if source:
+            yield source
+        return
+    view = _byteView(source)
+    if view is not None:
+        for start in range(0, len(view), chunkSize):
+            yield view[start:start + chunkSize]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunkSize)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
+
+
+# a flat byte view of source, or None if it does not export a buffer
+def _byteView(source):
+    try:
+        view = memoryview(source)
+    except TypeError:
+        return None
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
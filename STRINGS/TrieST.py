@@ -1,3 +1,7 @@
+import heapq
+from operator import itemgetter
+import FrozenTrieST
+
 """
 A string symbol table for extended ASCII strings, implemented
 dictionary based trie.
@@ -30,19 +34,39 @@ The put, contains, delete, and longest prefix operations take time proportional
 to the length of the key (in the worst case). Construction takes constant time.
 The size, and is-empty operations take constant time.
 Construction takes constant time.
+The lookup operations (get, contains, longestPrefixOf, keysWithPrefix and
+keysThatMatch) are iterative and never modify the trie, so any number of
+readers can share it, and delete removes the nodes it empties.
+Once a trie is built, freeze() converts it to a FrozenTrieST, which
+answers the same queries from flat arrays in a fraction of the memory.
+iterKeysWithPrefix generates the keys with a prefix lazily, so a caller
+that needs only the first few pays only for those.
+topKeysWithPrefix returns the keys with a prefix that have the largest
+values, by scanning every key with the prefix. rank() is the opt-in for
+tries that answer many such queries: it annotates every node with the
+largest value in its subtrie, which takes time proportional to the
+number of nodes, so that topKeysWithPrefix visits only the subtries that
+can hold the answer. From then on put and delete keep the annotations up
+to date, at an extra cost proportional to the length of the key times
+the number of children of the nodes on its path. topKeysWithPrefix
+itself never modifies the trie.
 """
 class TrieST(object):
 
     # trie node
     class Node:
+        __slots__ = ("val", "next", "best")
+
         def __init__(self):
             self.val = None
             self.next = {}
+            self.best = None # largest value in the subtrie, once ranked
 
     # Initializes an empty string symbol table.
     def __init__(self):
-        self.root = None # root of trie
-        self.n = 0       # number of keys in trie
+        self.root = None     # root of trie
+        self.n = 0           # number of keys in trie
+        self._ranked = False # are the best annotations of the nodes maintained?
 
     """
     Returns the value associated with the given key.
@@ -59,15 +83,12 @@ class TrieST(object):
         return x.val
     
     def _get(self, x: Node, key: str, d: int):
-        if x is None:
-            return None
-        if d == len(key):
-            return x
-        c = key[d]
-        if c in x.next:
-            return self._get(x.next[c], key, d + 1)
-        else: 
-            return None
+        while x is not None:
+            if d == len(key):
+                return x
+            x = x.next.get(key[d])
+            d += 1
+        return None
 
     """
     Does this symbol table contain the given key?
@@ -104,11 +125,15 @@ class TrieST(object):
             if x.val is None:
                 self.n += 1
             x.val = val
+            if self._ranked:
+                self._rank(x)
             return x
         c = key[d]
         if c not in x.next:
             x.next[c] = None
         x.next[c] = self._put(x.next[c], key, val, d + 1)
+        if self._ranked:
+            self._rank(x)
         return x
 
     """
@@ -133,28 +158,76 @@ class TrieST(object):
     def delete(self, key: str):
         if key is None:
             raise TypeError("argument of delete() is None")
-        self.root = self._delete(self.root, key, 0)
-    
-    def _delete(self, x: Node, key: str, d: int):
-        if x is None:
-            return None
-        if d == len(key):
-            if x.val is not None:
-                self.n -= 1
-            x.val = None
-        else:
-            c = key[d]
-            if c not in x.next:
-                x.next[c] = None
-            x.next[c] = self._delete(x.next[c], key, d + 1)
+        # find the node of key, remembering the path to it
+        path = []
+        x = self.root
+        for c in key:
+            if x is None:
+                return
+            path.append((x, c))
+            x = x.next.get(c)
+        if x is None or x.val is None:
+            return
+        x.val = None
+        self.n -= 1
+
+        # remove the nodes on the path that are left completely empty
+        while self._isEmptyNode(x):
+            if not path:
+                self.root = None
+                return
+            x, c = path.pop()
+            del x.next[c]
+        if self._ranked:
+            self._rank(x)
+            for x, c in reversed(path):
+                self._rank(x)
 
-        # remove subtrie rooted at x if it is completely empty
+    # a node is empty if it has no value and no children
+    @staticmethod
+    def _isEmptyNode(x: Node):
         if x.val is not None:
-            return x
-        for c in x.next.keys():
-            if x.next[c] is not None:
-                return x
-        return None
+            return False
+        for child in x.next.values():
+            if child is not None:
+                return False
+        return True
+
+    """
+    Removes the dead entries that old versions of the lookup operations
+    left in the trie (children that are None or that lead to no key),
+    which is useful to reclaim memory in long-running processes.
+    :returns: the number of entries removed
+    """
+    def compact(self):
+        if self.root is None:
+            return 0
+        removed = 0
+        # visit the nodes in postorder, so children are compacted before parents
+        stack = [(self.root, False)]
+        while stack:
+            x, done = stack.pop()
+            if not done:
+                stack.append((x, True))
+                for child in x.next.values():
+                    if child is not None:
+                        stack.append((child, False))
+                continue
+            for c in [c for c, child in x.next.items() if child is None or self._isEmptyNode(child)]:
+                del x.next[c]
+                removed += 1
+        if self._isEmptyNode(self.root):
+            self.root = None
+        return removed
+
+    """
+    Returns an immutable, array-backed copy of this symbol table, with the
+    same keys, values and key order. Later changes to this symbol table
+    are not reflected in the copy.
+    :returns: the symbol table, as a FrozenTrieST
+    """
+    def freeze(self):
+        return FrozenTrieST.FrozenTrieST.fromTrie(self.root)
 
     """
     Returns the string in the symbol table that is the longest prefix of query,
@@ -180,16 +253,14 @@ class TrieST(object):
     found a prefix match of given length (-1 if no such match)
     """
     def _longestPrefixOf(self, x: Node, query: str, d: int, length: int):
-        if x is None: 
-            return length
-        if x.val is not None:
-            length = d
-        if d == len(query):
-            return length
-        c = query[d]
-        if c not in x.next:
-            x.next[c] = None
-        return self._longestPrefixOf(x.next[c], query, d+1, length)
+        while x is not None:
+            if x.val is not None:
+                length = d
+            if d == len(query):
+                return length
+            x = x.next.get(query[d])
+            d += 1
+        return length
 
     """
     Returns all keys in the symbol table as a list.
@@ -204,22 +275,143 @@ class TrieST(object):
     :returns: all of the keys in the set that start with a given prefix,
     as a list
     """
-    def keysWithPrefix(self, prefix: str):
+    def keysWithPrefix(self, prefix: str, limit: int = None):
+        if limit is not None:
+            return list(self.iterKeysWithPrefix(prefix, limit))
         results = []
         x = self._get(self.root, prefix, 0)
         self._collect(x, prefix, results)
         return results
 
+    """
+    Generates the keys in the set that start with a given prefix, in the
+    same order as keysWithPrefix, visiting the trie only as far as the
+    keys are consumed.
+    :param prefix: the prefix
+    :param limit: the maximum number of keys to generate, or None for all
+    :returns: a generator over the keys that start with prefix
+    :raises ValueError: if limit is negative
+    """
+    def iterKeysWithPrefix(self, prefix: str, limit: int = None):
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be nonnegative")
+        if limit == 0:
+            return
+        stack = [(self._get(self.root, prefix, 0), prefix)]
+        count = 0
+        while stack:
+            x, prefix = stack.pop()
+            if x is None:
+                continue
+            if x.val is not None:
+                yield prefix
+                count += 1
+                if count == limit:
+                    return
+            for c in reversed(x.next):
+                stack.append((x.next[c], prefix + c))
 
     def _collect(self, x: Node, prefix: str, results: list):
-        if x is None:
+        # preorder, with the children pushed in reverse so that they are
+        # visited in the order of x.next
+        stack = [(x, prefix)]
+        while stack:
+            x, prefix = stack.pop()
+            if x is None:
+                continue
+            if x.val is not None:
+                results.append(prefix)
+            for c in reversed(x.next):
+                stack.append((x.next[c], prefix + c))
+
+    """
+    Returns the k keys that start with a given prefix and have the largest
+    values, in decreasing order of value (keys with equal values are
+    returned in no particular order). The values must be comparable.
+    The search is best-first once rank() has been called: a subtrie is
+    only visited if its largest value can still be among the k largest.
+    Otherwise every key with the prefix is scanned.
+    :param prefix: the prefix
+    :param k: the number of keys to return
+    :returns: the list of at most k keys that start with prefix and have
+    the largest values
+    :raises ValueError: if k is negative
+    """
+    def topKeysWithPrefix(self, prefix: str, k: int):
+        if k < 0:
+            raise ValueError("k must be nonnegative")
+        results = []
+        x = self._get(self.root, prefix, 0)
+        if x is None or k == 0:
+            return results
+        if not self._ranked:
+            return [key for _, key in heapq.nlargest(k, self._valuedKeys(x, prefix), key=itemgetter(0))]
+        if x.best is None:
+            return results
+        # entries are (value, kind, tiebreak, node, key); kind 0 is the key of
+        # node and kind 1 is the subtrie of node, so that keys come out first
+        pq = [(_Reversed(x.best), 1, 0, x, prefix)]
+        seq = 1
+        while pq:
+            best, kind, _, x, prefix = heapq.heappop(pq)
+            if kind == 0:
+                results.append(prefix)
+                if len(results) == k:
+                    break
+                continue
+            if x.val is not None:
+                heapq.heappush(pq, (_Reversed(x.val), 0, seq, x, prefix))
+                seq += 1
+            for c, child in x.next.items():
+                if child is not None and child.best is not None:
+                    heapq.heappush(pq, (_Reversed(child.best), 1, seq, child, prefix + c))
+                    seq += 1
+        return results
+
+    # the (value, key) pairs of the subtrie of x, whose path is prefix
+    @staticmethod
+    def _valuedKeys(x: Node, prefix: str):
+        stack = [(x, prefix)]
+        while stack:
+            x, prefix = stack.pop()
+            if x.val is not None:
+                yield x.val, prefix
+            for c, child in x.next.items():
+                if child is not None:
+                    stack.append((child, prefix + c))
+
+    # set the best annotation of x from its value and its children's
+    @staticmethod
+    def _rank(x: Node):
+        best = x.val
+        for child in x.next.values():
+            if child is not None and child.best is not None and (best is None or best < child.best):
+                best = child.best
+        x.best = best
+
+    """
+    Annotates every node with the largest value in its subtrie, so that
+    topKeysWithPrefix visits only the subtries that can hold the answer,
+    and makes put and delete keep the annotations up to date from then on.
+    Takes time proportional to the number of nodes the first time, and
+    does nothing on a trie that is already ranked.
+    """
+    def rank(self):
+        if self._ranked:
             return
-        if x.val is not None:
-            results.append(prefix)
-        for c in x.next.keys():
-            prefix = prefix + c
-            self._collect(x.next[c], prefix, results)
-            prefix = prefix[0:len(prefix) - 1]
+        if self.root is not None:
+            # visit the nodes in postorder, so children are ranked before parents
+            stack = [(self.root, False)]
+            while stack:
+                x, done = stack.pop()
+                if done:
+                    self._rank(x)
+                    continue
+                stack.append((x, True))
+                for child in x.next.values():
+                    if child is not None:
+                        stack.append((child, False))
+        self._ranked = True
 
     """
     Returns all of the keys in the symbol table that match specified pattern,
@@ -234,22 +426,33 @@ class TrieST(object):
         return results
 
     def _collectPattern(self, x: Node, prefix: str, pattern: str, results: list):
-        if x is None:
-            return
-        d = len(prefix)
-        if d == len(pattern) and x.val is not None:
-            results.append(prefix)
-        if d == len(pattern):
-            return
-        c = pattern[d]
-        if c == ".":
-            for ch in x.next.keys():
-                prefix = prefix + ch
-                self._collectPattern(x.next[ch], prefix, pattern, results)
-                prefix = prefix[0:len(prefix) - 1]
-        else:
-            prefix = prefix + c
-            if c not in x.next:
-                x.next[c] = None
-            self._collectPattern(x.next[c], prefix, pattern, results)
-            prefix = prefix[0:len(prefix) - 1]
+        stack = [(x, prefix)]
+        while stack:
+            x, prefix = stack.pop()
+            if x is None:
+                continue
+            d = len(prefix)
+            if d == len(pattern):
+                if x.val is not None:
+                    results.append(prefix)
+                continue
+            c = pattern[d]
+            if c == ".":
+                for ch in reversed(x.next):
+                    stack.append((x.next[ch], prefix + ch))
+            elif c in x.next:
+                stack.append((x.next[c], prefix + c))
+
+
+# reverses the order of a value, so that heapq pops the largest value first
+class _Reversed(object):
+    __slots__ = ("val",)
+
+    def __init__(self, val):
+        self.val = val
+
+    def __lt__(self, other):
+        return other.val < self.val
+
+    def __eq__(self, other):
+        return self.val == other.val